@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+import pydantic
+import reportlab
+
+from benchmarks.import_budget import import_times
+from impoved_code.config.output_profiles import PROFILES
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.renderers.invoice_renderer import InvoiceRenderer
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINE_ITEM_COUNTS = [1, 100, 1000, 10000]
+
+DESCRIPTIONS = [
+    "10% передоплата",
+    "25% після завантаження авто",
+    "65% післяплата",
+    "Дуже довгий опис товару з багатьма словами для тестування автоматичного переносу тексту в таблиці рахунку-фактури",
+]
+
+
+def make_invoice_dict(line_items: int = 3, number: str = "РФ-2024-001") -> dict:
+    """Raw invoice record as it arrives from an export"""
+    return {
+        "seller": {
+            "name": "ТОВ 'Технологічні Рішення'",
+            "edprou": "12345678",
+            "address": "вул. Інноваційна, 123, м. Київ, 01001",
+            "country": "Україна",
+        },
+        "buyer": {
+            "name": "ТОВ 'Цифрові Інновації'",
+            "edprou": "87654321",
+            "address": "просп. Бізнес, 456, м. Львів, 79000",
+            "country": "Україна",
+        },
+        "bank": {
+            "name": "ПриватБанк",
+            "mfo": "305299",
+            "address": "просп. Дмитра Яворницького, 1, м. Дніпро, 49000",
+            "swift": "PBANUA2X",
+            "iban": "UA123456789012345678901234567",
+        },
+        "invoice_number": number,
+        "invoice_date": "2024-01-15",
+        "due_date": "2024-02-15",
+        "source": "Договір №2024-001",
+        "line_items": [
+            {
+                "description": DESCRIPTIONS[index % len(DESCRIPTIONS)],
+                "quantity": str(Decimal(1 + index % 3)),
+                "unit_price": str(Decimal("1000.00") + index),
+            }
+            for index in range(line_items)
+        ],
+        "vat_rate": "20.0",
+        "currency": "UAH",
+    }
+
+
+def make_invoice(line_items: int = 3, number: str = "РФ-2024-001") -> InvoiceData:
+    return InvoiceData.model_validate(make_invoice_dict(line_items, number))
+
+
+def _time_call(func: Callable[[], object], repeat: int) -> float:
+    """Median wall time of a call in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _subprocess_time(code: str, env: Optional[dict] = None, repeat: int = 3) -> float:
+    """Median wall time of a fresh interpreter running code"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, env=env, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_cold_start(quick: bool) -> Dict[str, dict]:
+    """Fresh process: imports, font registration and the first render, with an empty and a warm font cache"""
+    code = (
+        "from benchmarks.bench import make_invoice\n"
+        "from impoved_code.renderers.invoice_renderer import InvoiceRenderer\n"
+        "InvoiceRenderer().render_to_bytes(make_invoice())\n"
+    )
+    repeat = 1 if quick else 3
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, INVOICE_FONT_CACHE_DIR=cache_dir)
+        results["cold_start_empty_font_cache"] = _metric(_subprocess_time(code, env, repeat=1), "s")
+        results["cold_start_warm_font_cache"] = _metric(_subprocess_time(code, env, repeat=repeat), "s")
+    return results
+
+
+def bench_imports(quick: bool) -> Dict[str, dict]:
+    """Cold import time of the package entry points"""
+    return {
+        f"import_{module.rsplit('.', 1)[-1]}": _metric(ms / 1000, "s")
+        for module, ms in import_times(repeat=1 if quick else 3).items()
+    }
+
+
+def bench_warm_render(quick: bool) -> Dict[str, dict]:
+    """Single 3-line invoice with fonts and components already initialized"""
+    renderer = InvoiceRenderer()
+    invoice_data = make_invoice()
+    renderer.render_to_bytes(invoice_data)
+    return {"warm_single_render": _metric(_time_call(lambda: renderer.render_to_bytes(invoice_data), 5 if quick else 30), "s")}
+
+
+def bench_line_items(quick: bool) -> Dict[str, dict]:
+    """Render time and output size against the number of line items"""
+    renderer = InvoiceRenderer()
+    results = {}
+    for count in LINE_ITEM_COUNTS:
+        if quick and count > 1000:
+            continue
+        invoice_data = make_invoice(count)
+        content = renderer.render_to_bytes(invoice_data)
+        repeat = 1 if count >= 1000 or quick else 5
+        results[f"render_{count}_line_items"] = _metric(_time_call(lambda: renderer.render_to_bytes(invoice_data), repeat), "s")
+        results[f"size_{count}_line_items"] = _metric(len(content), "bytes")
+    return results
+
+
+def bench_batch(quick: bool) -> Dict[str, dict]:
+    """Parallel batch throughput across all cores"""
+    count = 50 if quick else 400
+    jobs = [(make_invoice(number=f"РФ-{index}"), None) for index in range(count)]
+    renderer = InvoiceRenderer()
+    start = time.perf_counter()
+    results = renderer.render_many(jobs)
+    elapsed = time.perf_counter() - start
+    failed = sum(not result.success for result in results)
+    if failed:
+        raise RuntimeError(f"{failed} batch renders failed")
+    return {"batch_throughput": _metric(count / elapsed, "invoices/s", lower_is_better=False)}
+
+
+def bench_validation(quick: bool) -> Dict[str, dict]:
+    """Cost of validating raw records into InvoiceData"""
+    records = [make_invoice_dict(10, f"РФ-{index}") for index in range(200 if quick else 2000)]
+    raw = json.dumps(records, ensure_ascii=False).encode("utf-8")
+    count = len(records)
+    return {
+        "validate_10_item_record": _metric(
+            _time_call(lambda: [InvoiceData.model_validate(record) for record in records], 3) / count, "s"
+        ),
+        "validate_many_10_item_record": _metric(_time_call(lambda: InvoiceData.validate_many(records), 3) / count, "s"),
+        "validate_json_many_10_item_record": _metric(_time_call(lambda: InvoiceData.validate_json_many(raw), 3) / count, "s"),
+    }
+
+
+def bench_output_size(quick: bool) -> Dict[str, dict]:
+    """Size and warm render time of a typical 3-line invoice per output profile"""
+    invoice_data = make_invoice()
+    results = {}
+    for name in PROFILES:
+        renderer = InvoiceRenderer(output_profile=name)
+        suffix = "" if name == "default" else f"_{name}"
+        results[f"size_single_invoice{suffix}"] = _metric(len(renderer.render_to_bytes(invoice_data)), "bytes")
+        if name != "default":
+            seconds = _time_call(lambda: renderer.render_to_bytes(invoice_data), 5 if quick else 30)
+            results[f"warm_single_render_{name}"] = _metric(seconds, "s")
+    return results
+
+
+def bench_preview(quick: bool) -> Dict[str, dict]:
+    """PNG preview of a typical 3-line invoice at thumbnail and screen resolution"""
+    renderer = InvoiceRenderer()
+    invoice_data = make_invoice()
+    results = {}
+    for dpi in (36, 72):
+        renderer.render_preview(invoice_data, dpi=dpi)
+        seconds = _time_call(lambda: renderer.render_preview(invoice_data, dpi=dpi), 5 if quick else 30)
+        results[f"preview_{dpi}_dpi"] = _metric(seconds, "s")
+    return results
+
+
+SCENARIOS = {
+    "imports": bench_imports,
+    "cold_start": bench_cold_start,
+    "warm_render": bench_warm_render,
+    "line_items": bench_line_items,
+    "batch": bench_batch,
+    "validation": bench_validation,
+    "output_size": bench_output_size,
+    "preview": bench_preview,
+}
+
+
+def _metric(value: float, unit: str, lower_is_better: bool = True) -> dict:
+    return {"value": value, "unit": unit, "lower_is_better": lower_is_better}
+
+
+def run(scenarios: List[str], quick: bool = False) -> dict:
+    """Run scenarios and collect results with environment metadata"""
+    results = {}
+    for name in scenarios:
+        results.update(SCENARIOS[name](quick))
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "reportlab": reportlab.Version,
+            "pydantic": pydantic.VERSION,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> List[dict]:
+    """
+    Compare two result files metric by metric
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: Relative change treated as a regression, e.g. 0.1 for 10%
+
+    Returns:
+        List[dict]: One row per metric present in both runs
+    """
+    rows = []
+    for name, metric in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or not old["value"]:
+            continue
+        change = (metric["value"] - old["value"]) / old["value"]
+        worse = change if metric["lower_is_better"] else -change
+        rows.append(
+            {
+                "metric": name,
+                "unit": metric["unit"],
+                "baseline": old["value"],
+                "current": metric["value"],
+                "change": change,
+                "regression": worse > threshold,
+            }
+        )
+    return rows
+
+
+def format_report(rows: List[dict], threshold: float) -> str:
+    lines = [f"{'metric':<32} {'baseline':>14} {'current':>14} {'change':>9}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['metric']:<32} {row['baseline']:>14.6g} {row['current']:>14.6g} {row['change']:>+8.1%}{flag}"
+        )
+    regressions = sum(row["regression"] for row in rows)
+    lines.append(f"{regressions} regression(s) above {threshold:.0%}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invoice rendering benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write results as JSON")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    parser.add_argument("--scenarios", nargs="*", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--quick", action="store_true", help="Fewer repetitions and no 10,000-item render")
+    args = parser.parse_args()
+
+    current = run(args.scenarios, quick=args.quick)
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(current, output, indent=2, ensure_ascii=False)
+
+    for name, metric in current["results"].items():
+        print(f"{name:<32} {metric['value']:>14.6g} {metric['unit']}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(baseline, current, args.threshold)
+        print()
+        print(format_report(rows, args.threshold))
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module: (cold import budget in milliseconds, module prefixes that must not be loaded)
+BUDGETS = {
+    "impoved_code.config.settings": (50, ("reportlab", "PIL", "pydantic")),
+    "impoved_code.config.currencies": (50, ("reportlab", "PIL", "pydantic")),
+    "impoved_code.models.invoice_data": (350, ("reportlab", "PIL")),
+    "impoved_code.models.render_result": (350, ("reportlab", "PIL")),
+    "impoved_code.models.render_timings": (350, ("reportlab", "PIL")),
+    "impoved_code.services.money": (350, ("reportlab", "PIL")),
+    "impoved_code.renderers.invoice_renderer": (500, ("reportlab.platypus", "reportlab.lib.styles")),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure_import(module: str, repeat: int = 3) -> dict:
+    """
+    Import a module in fresh interpreters
+
+    Returns:
+        dict: Median import time in milliseconds and the modules loaded by the import
+    """
+    timings = []
+    modules: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=PROJECT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        timings.append(result["ms"])
+        modules = result["modules"]
+    return {"ms": statistics.median(timings), "modules": modules}
+
+
+def check_budgets(scale: float = 1.0, repeat: int = 3) -> List[dict]:
+    """
+    Measure every budgeted module
+
+    Args:
+        scale: Multiplier applied to the time budgets, e.g. 2 on slow CI machines
+        repeat: Fresh interpreters per module
+
+    Returns:
+        List[dict]: One row per module with the measurement and any violations
+    """
+    rows = []
+    for module, (budget_ms, forbidden) in BUDGETS.items():
+        measured = measure_import(module, repeat)
+        loaded = sorted(
+            name for name in measured["modules"] if any(name == prefix or name.startswith(prefix + ".") for prefix in forbidden)
+        )
+        rows.append(
+            {
+                "module": module,
+                "ms": measured["ms"],
+                "budget_ms": budget_ms * scale,
+                "over_budget": measured["ms"] > budget_ms * scale,
+                "forbidden_loaded": loaded,
+            }
+        )
+    return rows
+
+
+def import_times(repeat: int = 3) -> Dict[str, float]:
+    """Median cold import time per budgeted module, for the benchmark suite"""
+    return {module: measure_import(module, repeat)["ms"] for module in BUDGETS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check cold import time and lazily loaded modules")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the time budgets")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters per module")
+    args = parser.parse_args()
+
+    failed = False
+    for row in check_budgets(args.scale, args.repeat):
+        problems = []
+        if row["over_budget"]:
+            problems.append(f"over budget of {row['budget_ms']:.0f} ms")
+        if row["forbidden_loaded"]:
+            problems.append("loads " + ", ".join(row["forbidden_loaded"][:5]))
+        failed = failed or bool(problems)
+        status = "FAIL " + "; ".join(problems) if problems else "ok"
+        print(f"{row['module']:<42} {row['ms']:>8.1f} ms  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,27 @@ class CurrencyMapping:
         "ETH": "Ξ",
     }
 
+    # ISO 4217 minor unit exponents; currencies not listed use DEFAULT_MINOR_UNITS
+    MINOR_UNITS = {
+        "JPY": 0,
+        "KRW": 0,
+        "ISK": 0,
+        "CLP": 0,
+        "VND": 0,
+        "BHD": 3,
+        "JOD": 3,
+        "KWD": 3,
+        "OMR": 3,
+        "TND": 3,
+        "BTC": 8,
+        "ETH": 18,
+    }
+    DEFAULT_MINOR_UNITS = 2
+
+    @classmethod
+    def get_minor_units(cls, currency_code: str) -> int:
+        return cls.MINOR_UNITS.get(currency_code.upper(), cls.DEFAULT_MINOR_UNITS)
+
     @classmethod
     def get_symbol(cls, currency_code: str) -> str:
         return cls.CURRENCY_MAPPING.get(currency_code.upper(), currency_code) 
\ No newline at end of file
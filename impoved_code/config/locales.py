@@ -0,0 +1,24 @@
+from typing import NamedTuple
+
+
+class LocaleFormat(NamedTuple):
+    """Number and currency conventions of a locale"""
+
+    decimal: str
+    group: str
+    # Currency symbol before the number ("$1,234.50") or after it ("1 234,50 ₴")
+    symbol_first: bool
+    # Space between a leading symbol and the number; a trailing symbol is always separated
+    symbol_space: bool
+
+
+LOCALES = {
+    # Groups are separated by a no-break space, as in CLDR
+    "uk_UA": LocaleFormat(decimal=",", group="\u00a0", symbol_first=False, symbol_space=True),
+    "en_US": LocaleFormat(decimal=".", group=",", symbol_first=True, symbol_space=False),
+    "en_GB": LocaleFormat(decimal=".", group=",", symbol_first=True, symbol_space=False),
+    "de_DE": LocaleFormat(decimal=",", group=".", symbol_first=False, symbol_space=True),
+    "pl_PL": LocaleFormat(decimal=",", group="\u00a0", symbol_first=False, symbol_space=True),
+    # Output of the original renderer: "$ 1234.50"
+    "C": LocaleFormat(decimal=".", group="", symbol_first=True, symbol_space=True),
+}
@@ -0,0 +1,36 @@
+from typing import NamedTuple, Union
+
+
+class OutputProfile(NamedTuple):
+    """Trade-off between render time and PDF size"""
+
+    name: str
+    # Compress page and form streams
+    page_compression: bool = True
+    # zlib level for embedded font programs, 1 (fastest) to 9 (smallest)
+    compression_level: int = 6
+    # Drop TrueType hinting from font subsets; hinting only matters for
+    # rasterizing at small pixel sizes and makes up most of the subset size
+    strip_font_hinting: bool = False
+
+
+# reportlab's own output
+DEFAULT = OutputProfile("default")
+
+# Least CPU per invoice: nothing is compressed, at the cost of larger files
+FASTEST = OutputProfile("fastest", page_compression=False)
+
+# Least bytes per invoice, e.g. for long-term archives
+SMALLEST = OutputProfile("smallest", compression_level=9, strip_font_hinting=True)
+
+PROFILES = {profile.name: profile for profile in (DEFAULT, FASTEST, SMALLEST)}
+
+
+def get_profile(profile: Union[str, OutputProfile]) -> OutputProfile:
+    """Output profile by name, passing profile objects through"""
+    if isinstance(profile, OutputProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown output profile {profile!r}, expected one of {', '.join(PROFILES)}") from None
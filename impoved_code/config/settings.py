@@ -1,6 +1,17 @@
 # Перенесено
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
+import hashlib
+import json
+
+
+def hex_color(value: str) -> tuple:
+    """RGB tuple in the 0..1 range, accepted by canvas.setFillColor without reportlab color objects"""
+    value = value.lstrip("#")
+    return tuple(int(value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+
+
+# A4 in points, as reportlab.lib.pagesizes.A4, so importing settings does not load reportlab
+MM = 72.0 / 2.54 * 0.1
+A4 = (210 * MM, 297 * MM)
 
 
 class InvoiceSettings:
@@ -52,9 +63,9 @@ class InvoiceSettings:
     LOGO_TEXT = "In Bulk"
 
     # Colors
-    PRIMARY_COLOR = colors.HexColor("#800080")
-    TEXT_COLOR = colors.black
-    WHITE_COLOR = colors.white
+    PRIMARY_COLOR = hex_color("#800080")
+    TEXT_COLOR = hex_color("#000000")
+    WHITE_COLOR = hex_color("#ffffff")
 
     # Fonts
     TITLE_FONT = "Times-Bold"
@@ -62,13 +73,26 @@ class InvoiceSettings:
     BOLD_FONT = "Times-Bold"
     ITALIC_FONT = "Times-Italic"
 
+    # Number and currency formatting, a key of config.locales.LOCALES
+    LOCALE = "uk_UA"
+
     # Page settings
     PAGE_SIZE = A4
     PAGE_WIDTH, PAGE_HEIGHT = A4
 
+    @classmethod
+    def get_font_names(cls) -> tuple:
+        """Font faces referenced by the invoice layout"""
+        return tuple(dict.fromkeys((cls.NORMAL_FONT, cls.BOLD_FONT, cls.TITLE_FONT)))
+
     @classmethod
     def get_table_layout(cls):
         table_width = sum(cls.TABLE_COL_WIDTHS)
         page_center = cls.PAGE_WIDTH / 2
         table_center_x = page_center - table_width / 2
-        return table_width, table_center_x 
\ No newline at end of file
+        return table_width, table_center_x
+
+    def fingerprint(self) -> str:
+        """Stable hash of all settings values, used as a cache key"""
+        values = {name: repr(getattr(self, name)) for name in dir(self) if name.isupper()}
+        return hashlib.sha256(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()
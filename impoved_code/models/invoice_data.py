@@ -1,8 +1,10 @@
 # Перенесено
-from typing import List, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 from decimal import Decimal
-from pydantic import BaseModel, Field, computed_field, validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, ValidationError, computed_field, field_validator
 from datetime import date, datetime
+from functools import lru_cache
+from impoved_code.models.invoice_totals import InvoiceTotals
 
 
 class CompanyInfo(BaseModel):
@@ -11,8 +13,8 @@ class CompanyInfo(BaseModel):
     address: str = Field(..., description="Company address")
     country: str = Field(..., description="Country")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Example Company Ltd",
                 "edprou": "12345678",
@@ -20,6 +22,7 @@ class CompanyInfo(BaseModel):
                 "country": "Ukraine"
             }
         }
+    )
 
 
 class BankDetails(BaseModel):
@@ -29,8 +32,8 @@ class BankDetails(BaseModel):
     swift: str = Field(..., description="SWIFT code")
     iban: str = Field(..., description="IBAN code")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "PrivatBank",
                 "mfo": "305299",
@@ -39,6 +42,7 @@ class BankDetails(BaseModel):
                 "iban": "UA123456789012345678901234567"
             }
         }
+    )
 
 
 class LineItem(BaseModel):
@@ -61,21 +65,23 @@ class LineItem(BaseModel):
             "amount": self.amount
         }
 
-    @validator('quantity', 'unit_price', pre=True)
-    def parse_decimals(cls, v):
-        """Parse strings to Decimal if needed."""
-        if isinstance(v, str):
-            return Decimal(v)
-        return v
+    @classmethod
+    def iter_validate(cls, records: Iterable[Union["LineItem", Mapping[str, Any]]]) -> Iterator["LineItem"]:
+        """Validate line items one at a time as they are consumed, passing LineItem instances through."""
+        for record in records:
+            yield record if isinstance(record, cls) else cls.model_validate(record)
 
-    class Config:
-        json_schema_extra = {
+    # Frozen so cached invoice totals cannot go stale through an edited line
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "description": "Web Development Services",
                 "quantity": "10.0",
                 "unit_price": "100.00"
             }
         }
+    )
 
 
 class InvoiceData(BaseModel):
@@ -86,27 +92,50 @@ class InvoiceData(BaseModel):
     invoice_date: date = Field(..., description="Invoice date")
     due_date: date = Field(..., description="Due date")
     source: str = Field(..., description="Source document")
-    line_items: List[LineItem] = Field(default_factory=list, description="Line items")
+    line_items: Tuple[LineItem, ...] = Field(default_factory=tuple, description="Line items")
     vat_rate: Decimal = Field(default=Decimal('20.0'), ge=0, le=100, description="VAT rate percentage")
     currency: str = Field(default="USD", description="Currency code")
 
+    # (line_items, vat_rate, currency, totals) of the last totals computation
+    _totals_cache: Optional[tuple] = PrivateAttr(default=None)
+
+    @property
+    def totals(self) -> InvoiceTotals:
+        """
+        Line, VAT and total amounts in minor units, computed once per invoice.
+
+        The cached totals are kept while line_items is the same tuple and vat_rate and
+        currency are unchanged, so assignments and model_copy(update=...) recompute them.
+        """
+        line_items, vat_rate, currency = self.line_items, self.vat_rate, self.currency
+        cache = self._totals_cache
+        if cache is not None and cache[0] is line_items and cache[1] == vat_rate and cache[2] == currency:
+            return cache[3]
+
+        # Imported here to avoid a circular import
+        from impoved_code.services.money import compute_totals
+
+        totals = compute_totals(line_items, vat_rate, currency)
+        self._totals_cache = (line_items, vat_rate, currency, totals)
+        return totals
+
     @computed_field
     @property
     def subtotal(self) -> Decimal:
         """Calculate the subtotal of all line items."""
-        return sum(item.amount for item in self.line_items)
+        return self.totals.subtotal
 
     @computed_field
     @property
     def vat_amount(self) -> Decimal:
         """Calculate the VAT amount based on subtotal and VAT rate."""
-        return self.subtotal * (self.vat_rate / Decimal('100'))
+        return self.totals.vat_amount
 
     @computed_field
     @property
     def total(self) -> Decimal:
         """Calculate the total amount including VAT."""
-        return self.subtotal + self.vat_amount
+        return self.totals.total
 
     @computed_field
     @property
@@ -114,28 +143,36 @@ class InvoiceData(BaseModel):
         """Get line items as a list of dictionaries."""
         return [item.to_dict() for item in self.line_items]
 
-    @validator('invoice_date', 'due_date', pre=True)
-    def parse_dates(cls, v):
-        """Parse date strings to date objects if needed."""
-        if isinstance(v, str):
+    @field_validator('invoice_date', 'due_date', mode='wrap')
+    @classmethod
+    def parse_dates(cls, v, handler):
+        """Parse ISO dates natively and fall back to DD.MM.YYYY, DD/MM/YYYY and unpadded forms."""
+        try:
+            return handler(v)
+        except ValidationError:
+            if not isinstance(v, str):
+                raise
+        for date_format in ('%d.%m.%Y', '%d/%m/%Y', '%Y-%m-%d'):
             try:
-                return datetime.strptime(v, '%Y-%m-%d').date()
+                return datetime.strptime(v, date_format).date()
             except ValueError:
-                try:
-                    return datetime.strptime(v, '%d.%m.%Y').date()
-                except ValueError:
-                    raise ValueError('Date must be in YYYY-MM-DD or DD.MM.YYYY format')
-        return v
-
-    @validator('vat_rate', pre=True)
-    def parse_vat_rate(cls, v):
-        """Parse VAT rate string to Decimal if needed."""
-        if isinstance(v, str):
-            return Decimal(v)
-        return v
-
-    class Config:
-        json_schema_extra = {
+                pass
+        raise ValueError('Date must be in YYYY-MM-DD, DD.MM.YYYY or DD/MM/YYYY format')
+
+    @classmethod
+    def validate_many(cls, records: Iterable[Mapping[str, Any]]) -> List["InvoiceData"]:
+        """Validate a batch of records in one pydantic-core call."""
+        return _invoice_list_adapter().validate_python(list(records))
+
+    @classmethod
+    def validate_json_many(cls, data: Union[str, bytes]) -> List["InvoiceData"]:
+        """Validate a JSON array of invoices straight from raw bytes, without json.loads."""
+        return _invoice_list_adapter().validate_json(data)
+
+    # Assigned line items are validated into a tuple, the key of the cached totals
+    model_config = ConfigDict(
+        validate_assignment=True,
+        json_schema_extra={
             "example": {
                 "seller": {
                     "name": "Seller Company Ltd",
@@ -170,4 +207,11 @@ class InvoiceData(BaseModel):
                 "vat_rate": "20.0",
                 "currency": "USD"
             }
-        } 
\ No newline at end of file
+        }
+    )
+
+
+@lru_cache(maxsize=None)
+def _invoice_list_adapter() -> TypeAdapter:
+    """Adapter for List[InvoiceData], built on first bulk validation."""
+    return TypeAdapter(List[InvoiceData])
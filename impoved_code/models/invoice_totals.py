@@ -0,0 +1,27 @@
+from decimal import Decimal
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class InvoiceTotals(BaseModel):
+    currency: str = Field(..., description="Currency code")
+    exponent: int = Field(..., description="ISO 4217 minor unit exponent")
+    line_amounts: List[int] = Field(default_factory=list, description="Line amounts in minor units")
+    subtotal_minor: int = Field(..., description="Amount without VAT in minor units")
+    vat_minor: int = Field(..., description="VAT amount in minor units")
+    total_minor: int = Field(..., description="Amount including VAT in minor units")
+
+    @property
+    def subtotal(self) -> Decimal:
+        """Amount without VAT"""
+        return Decimal(self.subtotal_minor).scaleb(-self.exponent)
+
+    @property
+    def vat_amount(self) -> Decimal:
+        """VAT amount"""
+        return Decimal(self.vat_minor).scaleb(-self.exponent)
+
+    @property
+    def total(self) -> Decimal:
+        """Amount including VAT"""
+        return Decimal(self.total_minor).scaleb(-self.exponent)
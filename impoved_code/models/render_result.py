@@ -0,0 +1,11 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class RenderResult(BaseModel):
+    index: int = Field(..., description="Position of the job in the submitted batch")
+    invoice_number: Optional[str] = Field(default=None, description="Invoice number")
+    target: Optional[str] = Field(default=None, description="Output target")
+    success: bool = Field(..., description="Whether the invoice was rendered")
+    content: Optional[bytes] = Field(default=None, description="PDF bytes when rendered in memory")
+    error: Optional[str] = Field(default=None, description="Error message if rendering failed")
@@ -0,0 +1,22 @@
+from typing import Dict, Optional
+from pydantic import BaseModel, Field, computed_field
+
+
+class RenderTimings(BaseModel):
+    invoice_number: Optional[str] = Field(default=None, description="Invoice number, None for multi-invoice documents")
+    invoices: int = Field(default=1, description="Number of invoices drawn into the document")
+    pages: int = Field(default=0, description="Number of pages")
+    seconds: Dict[str, float] = Field(default_factory=dict, description="Wall time per render stage")
+    draw_ops: Dict[str, int] = Field(default_factory=dict, description="PDF operators written to page streams per stage")
+    output_bytes: int = Field(default=0, description="Size of the PDF document")
+    cached: bool = Field(default=False, description="Whether the document came from the render cache")
+    profile: Optional[str] = Field(default=None, description="Output profile the document was written with")
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    @computed_field
+    @property
+    def bytes_per_invoice(self) -> float:
+        return self.output_bytes / self.invoices if self.invoices else 0.0
@@ -0,0 +1,134 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+
+from impoved_code.config.output_profiles import OutputProfile
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.services import batch_renderer
+
+
+class AsyncInvoiceRenderer:
+    """Renders invoices from asyncio code without blocking the event loop"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        output_profile: Union[str, OutputProfile] = "default",
+        settings: Optional[InvoiceSettings] = None,
+    ):
+        """
+        Args:
+            max_concurrency: Maximum number of renders running or queued in the executor
+            workers: Number of worker processes of the managed executor (defaults to CPU count)
+            executor: Executor to use instead of a managed process pool; it is not shut down on close
+            output_profile: Output profile of the managed executor's renderers
+            settings: Layout settings of the managed executor's renderers (defaults to InvoiceSettings)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.output_profile = output_profile
+        self.settings = settings
+        self.max_concurrency = max_concurrency or self.workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+
+    async def render(self, invoice_data: InvoiceData, timeout: Optional[float] = None) -> bytes:
+        """
+        Render invoice to PDF bytes in the executor
+
+        The concurrency slot is held until the executor is done with the render: when the
+        awaiting task is cancelled or times out, a render that has not started yet is removed
+        from the executor queue, while a running one keeps its slot until it finishes.
+
+        Args:
+            invoice_data: Invoice data
+            timeout: Seconds to wait for the render, including time spent waiting for a slot
+
+        Returns:
+            bytes: PDF document
+        """
+        if timeout is not None:
+            return await asyncio.wait_for(self.render(invoice_data), timeout)
+
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            executor = self._get_executor()
+            try:
+                future = executor.submit(batch_renderer._worker_render_to_bytes, invoice_data)
+            except BrokenProcessPool:
+                executor = self._replace_executor(executor)
+                future = executor.submit(batch_renderer._worker_render_to_bytes, invoice_data)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        self.active += 1
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: self._call_in_loop(loop, self._release, semaphore))
+        try:
+            # Cancelling the wrapper cancels the executor future if it has not started
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # A worker died; the next render gets a fresh pool
+            self._replace_executor(executor)
+            raise
+
+    def _release(self, semaphore: asyncio.Semaphore):
+        self.active -= 1
+        semaphore.release()
+
+    @staticmethod
+    def _call_in_loop(loop: asyncio.AbstractEventLoop, callback, *args):
+        """Run a callback on the event loop from an executor thread"""
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop is already closed; nothing is waiting for the slot
+            pass
+
+    async def close(self):
+        """Shut down the managed executor"""
+        if self._owns_executor and self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def __aenter__(self) -> "AsyncInvoiceRenderer":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _replace_executor(self, broken: Executor) -> Executor:
+        """Replace a managed pool whose worker died; a caller-supplied executor is kept"""
+        if self._owns_executor and self._executor is broken:
+            self._executor = None
+            broken.shutdown(wait=False, cancel_futures=True)
+        return self._get_executor()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=batch_renderer._init_worker,
+                initargs=(self.output_profile, self.settings),
+            )
+        return self._executor
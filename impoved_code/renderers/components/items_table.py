@@ -1,99 +1,363 @@
 from reportlab.pdfgen import canvas
-from reportlab.platypus import Table, TableStyle
-from reportlab.platypus import Paragraph
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.pagesizes import A4
-from typing import List
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
 from decimal import Decimal
+from functools import cached_property
 from impoved_code.config.settings import InvoiceSettings
 from impoved_code.models.invoice_data import LineItem
+from impoved_code.services.formatting import get_formatter
+from impoved_code.services.money import TotalsAccumulator
+from impoved_code.services.text_layout import TextLayoutCache, default_layout_cache
+
+if TYPE_CHECKING:
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.platypus import Paragraph, TableStyle
+
+
+class _PlatypusTablePage:
+    """Collects one page of rows and draws it as a platypus Table"""
+
+    def __init__(self, renderer: "ItemsTableRenderer", canvas_obj: canvas.Canvas, table_top: float):
+        self.renderer = renderer
+        self.canvas_obj = canvas_obj
+        self.table_top = table_top
+        self.rows = [renderer.settings.TABLE_HEADERS]
+        self.heights = [renderer.single_row_height]
+        self.carry_rows = []
+
+    def add_row(self, cells: list, row_height: float):
+        self.rows.append(cells)
+        self.heights.append(row_height)
+
+    def add_carry_row(self, text: str, amount_text: str):
+        self.carry_rows.append(len(self.rows))
+        self.rows.append([text, "", "", "", amount_text])
+        self.heights.append(self.renderer.single_row_height)
+
+    def finish(self) -> float:
+        from reportlab.platypus import Table, TableStyle
+
+        settings = self.renderer.settings
+
+        # Create and style table
+        table = Table(self.rows, colWidths=settings.TABLE_COL_WIDTHS, rowHeights=self.heights)
+        table.setStyle(self.renderer.table_style)
+
+        # Carried-forward rows span the description, quantity, price and VAT columns
+        if self.carry_rows:
+            carry_commands = []
+            for row in self.carry_rows:
+                carry_commands.append(("SPAN", (0, row), (3, row)))
+                carry_commands.append(("FONTNAME", (0, row), (-1, row), settings.BOLD_FONT))
+            table.setStyle(TableStyle(carry_commands))
+
+        # Calculate table position
+        table.wrapOn(self.canvas_obj, settings.PAGE_WIDTH, settings.PAGE_HEIGHT)
+        table_y = self.table_top - table._height
+
+        # Draw table
+        _, table_center_x = settings.get_table_layout()
+        table.drawOn(self.canvas_obj, table_center_x, table_y)
+
+        return table_y
+
+
+class _DirectTablePage:
+    """Draws rows straight onto the canvas as they are added"""
+
+    def __init__(self, renderer: "ItemsTableRenderer", canvas_obj: canvas.Canvas, table_top: float):
+        self.renderer = renderer
+        self.canvas_obj = canvas_obj
+        self.y = table_top
+
+        settings = renderer.settings
+        padding = renderer.CELL_PADDING
+        _, table_center_x = settings.get_table_layout()
+
+        # Cell text anchors: description left aligned, numeric columns right aligned
+        col_x = table_center_x
+        self.right_x = []
+        for col_width in settings.TABLE_COL_WIDTHS:
+            self.right_x.append(col_x + col_width - padding)
+            col_x += col_width
+        self.left_x = table_center_x + padding
+
+        # Header row
+        baseline = self.y - padding - settings.FONT_SIZE_NORMAL
+        canvas_obj.setFillColor(settings.TEXT_COLOR)
+        canvas_obj.setFont(settings.BOLD_FONT, settings.FONT_SIZE_NORMAL)
+        canvas_obj.drawString(self.left_x, baseline, settings.TABLE_HEADERS[0])
+        for x, header in zip(self.right_x[1:], settings.TABLE_HEADERS[1:]):
+            canvas_obj.drawRightString(x, baseline, header)
+        self.y -= renderer.single_row_height
+
+        canvas_obj.setFont(settings.NORMAL_FONT, settings.FONT_SIZE_SMALL)
+
+    def add_row(self, cells: list, row_height: float):
+        renderer = self.renderer
+        canvas_obj = self.canvas_obj
+        baseline = self.y - renderer.CELL_PADDING - renderer.settings.FONT_SIZE_SMALL
+
+        description = cells[0]
+        if isinstance(description, list):
+            line_y = baseline
+            for line in description:
+                canvas_obj.drawString(self.left_x, line_y, line)
+                line_y -= renderer.CELL_LEADING
+        else:
+            # Rich markup keeps using platypus for this cell only
+            _, paragraph_height = description.wrap(renderer.description_width, renderer.settings.PAGE_HEIGHT)
+            description.drawOn(canvas_obj, self.left_x, self.y - renderer.CELL_PADDING - paragraph_height)
+            canvas_obj.setFillColor(renderer.settings.TEXT_COLOR)
+            canvas_obj.setFont(renderer.settings.NORMAL_FONT, renderer.settings.FONT_SIZE_SMALL)
+
+        for x, text in zip(self.right_x[1:], cells[1:]):
+            canvas_obj.drawRightString(x, baseline, text)
+
+        self.y -= row_height
+
+    def add_carry_row(self, text: str, amount_text: str):
+        renderer = self.renderer
+        settings = renderer.settings
+        baseline = self.y - renderer.CELL_PADDING - settings.FONT_SIZE_SMALL
+
+        self.canvas_obj.setFont(settings.BOLD_FONT, settings.FONT_SIZE_SMALL)
+        self.canvas_obj.drawRightString(self.right_x[3], baseline, text)
+        self.canvas_obj.drawRightString(self.right_x[4], baseline, amount_text)
+        self.canvas_obj.setFont(settings.NORMAL_FONT, settings.FONT_SIZE_SMALL)
+
+        self.y -= renderer.single_row_height
+
+    def finish(self) -> float:
+        return self.y
 
 
 class ItemsTableRenderer:
     """Renderer for items table"""
-    
-    def __init__(self, settings: InvoiceSettings):
+
+    # Cell padding and line leading used by the table style
+    CELL_PADDING = 6
+    CELL_LEADING = 12
+
+    CARRIED_IN_TEXT = "Перенесено з попередньої сторінки:"
+    CARRIED_OUT_TEXT = "Перенесено на наступну сторінку:"
+
+    def __init__(
+        self, settings: InvoiceSettings, fast_path: bool = True, layout_cache: Optional[TextLayoutCache] = None
+    ):
+        """
+        Args:
+            settings: Invoice settings
+            fast_path: Measure, wrap and draw plain rows directly on the canvas;
+                platypus is then used only for descriptions with markup
+            layout_cache: Cache of wrapped descriptions (defaults to the process-wide cache)
+        """
         self.settings = settings
+        self.fast_path = fast_path
+        self.layout_cache = layout_cache or default_layout_cache
+
+        self.single_row_height = self.CELL_LEADING + self.CELL_PADDING * 2
+        self.description_width = settings.TABLE_COL_WIDTHS[0] - self.CELL_PADDING * 2
+
+    # Styles are built on first use, so the fast path never imports platypus,
+    # and then shared by every page and invoice
+    @cached_property
+    def description_style(self) -> "ParagraphStyle":
+        from reportlab.lib.styles import ParagraphStyle
+
+        return ParagraphStyle(
+            name="DescriptionStyle",
+            fontName=self.settings.NORMAL_FONT,
+            fontSize=self.settings.FONT_SIZE_SMALL,
+            leading=self.CELL_LEADING,
+            wordWrap="CJK",
+        )
+
+    @cached_property
+    def table_style(self) -> "TableStyle":
+        from reportlab.platypus import TableStyle
+
+        settings = self.settings
+        return TableStyle(
+            [
+                ("ALIGN", (0, 0), (0, 0), "LEFT"),
+                ("ALIGN", (1, 0), (-1, 0), "RIGHT"),
+                ("ALIGN", (0, 1), (0, -1), "RIGHT"),
+                ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("FONTNAME", (0, 0), (-1, 0), settings.BOLD_FONT),
+                ("FONTSIZE", (0, 0), (-1, 0), settings.FONT_SIZE_NORMAL),
+                ("FONTNAME", (0, 1), (-1, -1), settings.NORMAL_FONT),
+                ("FONTSIZE", (0, 1), (-1, -1), settings.FONT_SIZE_SMALL),
+                ("LEFTPADDING", (0, 0), (-1, -1), self.CELL_PADDING),
+                ("RIGHTPADDING", (0, 0), (-1, -1), self.CELL_PADDING),
+                ("TOPPADDING", (0, 0), (-1, -1), self.CELL_PADDING),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), self.CELL_PADDING),
+            ]
+        )
 
-    def draw(self, canvas_obj: canvas.Canvas, line_items: List[LineItem], vat_rate: Decimal, currency: str, start_y: float):
+    def draw(
+        self,
+        canvas_obj: canvas.Canvas,
+        line_items: Iterable[LineItem],
+        vat_rate: Decimal,
+        currency: str,
+        start_y: float,
+        new_page: Optional[Callable[[canvas.Canvas], float]] = None,
+        accumulator: Optional[TotalsAccumulator] = None,
+    ):
         """
         Draw items table
-        
+
         Args:
             canvas_obj: Canvas for drawing
-            line_items: List of line items
+            line_items: Line items; any iterable, consumed once while the rows are drawn
             vat_rate: VAT rate
-            currency: Currency symbol
+            currency: Currency code
             start_y: Starting Y coordinate
-            
+            new_page: Callback that starts a continuation page and returns the table top on it;
+                without it the table is drawn on a single page
+            accumulator: Totals accumulator for the invoice currency; amounts are computed
+                in minor units in the same pass that draws the rows
+
         Returns:
             tuple: (subtotal, total_vat, new_y)
         """
-        subtotal = Decimal('0')
-        table_data = [self.settings.TABLE_HEADERS]
+        page_class = _DirectTablePage if self.fast_path else _PlatypusTablePage
+        if accumulator is None:
+            accumulator = TotalsAccumulator(vat_rate, currency, keep_lines=False)
+        formatter = get_formatter(currency, self.settings.LOCALE)
+        vat_text = formatter.format_percent(vat_rate)
 
-        # Style for item description
-        description_style = ParagraphStyle(
-            name="DescriptionStyle",
-            fontName=self.settings.NORMAL_FONT,
-            fontSize=self.settings.FONT_SIZE_SMALL,
-            leading=12,
-            wordWrap="CJK",
-        )
+        table_top = start_y - self.settings.SECTION_TABLE_OFFSET + 30
+        table_bottom_limit = self.settings.MARGIN_BOTTOM + self.settings.SPACING_LARGE
 
-        # Add line items to table
-        for index, item in enumerate(line_items, 1):
-            amount = item.amount
-            subtotal += amount
+        page = page_class(self, canvas_obj, table_top)
+        page_height = self.single_row_height
+        # Whether the current page is a continuation page with no rows yet
+        fresh_continuation = False
 
+        # Rows are measured once and placed greedily, so layout cost is linear in the number of items
+        for index, item in enumerate(line_items, 1):
             # Add automatic numbering to description
-            numbered_description = f"{index}. {item.description}"
-            description_paragraph = Paragraph(numbered_description, description_style)
-
-            table_data.append(
-                [
-                    description_paragraph,
-                    f"{item.quantity:.2f}",
-                    f"{item.unit_price:.2f}",
-                    f"{vat_rate}%",
-                    f"{currency} {amount:.2f}",
-                ]
-            )
+            description, row_height = self.layout_description(f"{index}.", item.description)
 
-        # Create and style table
-        table = Table(table_data, colWidths=self.settings.TABLE_COL_WIDTHS)
-        table.setStyle(
-            TableStyle(
-                [
-                    ("ALIGN", (0, 0), (0, 0), "LEFT"),
-                    ("ALIGN", (1, 0), (-1, 0), "RIGHT"),
-                    ("ALIGN", (0, 1), (0, -1), "RIGHT"),
-                    ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("FONTNAME", (0, 0), (-1, 0), self.settings.BOLD_FONT),
-                    ("FONTSIZE", (0, 0), (-1, 0), self.settings.FONT_SIZE_NORMAL),
-                    ("FONTNAME", (0, 1), (-1, -1), self.settings.NORMAL_FONT),
-                    ("FONTSIZE", (0, 1), (-1, -1), self.settings.FONT_SIZE_SMALL),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                    ("TOPPADDING", (0, 0), (-1, -1), 6),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                ]
-            )
-        )
+            amount_minor = accumulator.add(item.quantity, item.unit_price)
+            cells = [
+                formatter.format_number(item.quantity),
+                formatter.format_price(item.unit_price),
+                vat_text,
+                formatter.format_minor(amount_minor),
+            ]
 
-        # Calculate table position
-        table.wrapOn(canvas_obj, A4[0], A4[1])
-        table_height = table._height
+            while True:
+                # Keep room for the carried-forward row at the end of a full page
+                available = table_top - page_height - self.single_row_height - table_bottom_limit
+                if new_page is None or row_height <= available:
+                    break
 
-        base_table_y = start_y - self.settings.SECTION_TABLE_OFFSET
-        table_y = base_table_y - table_height + 30
+                # A row taller than a whole continuation page is split across pages
+                if fresh_continuation:
+                    split = self.split_description(description, available)
+                    if split is None:
+                        break
+                    piece, piece_height, description, row_height = split
+                    page.add_row([piece, *cells], piece_height)
+                    page_height += piece_height
+                    # Amounts are shown next to the first part of the description only
+                    cells = ["", "", "", ""]
 
-        # Draw table
-        table_width, table_center_x = self.settings.get_table_layout()
-        table.drawOn(canvas_obj, table_center_x, table_y)
+                # Amounts of a split row are carried with the page that shows them
+                carried_minor = accumulator.subtotal_minor
+                if cells[3]:
+                    carried_minor -= amount_minor
+                subtotal = formatter.format_minor(carried_minor)
+                page.add_carry_row(self.CARRIED_OUT_TEXT, subtotal)
+                page.finish()
+
+                table_top = new_page(canvas_obj)
+                page = page_class(self, canvas_obj, table_top)
+                page.add_carry_row(self.CARRIED_IN_TEXT, subtotal)
+                page_height = self.single_row_height * 2
+                fresh_continuation = True
+
+            page.add_row([description, *cells], row_height)
+            page_height += row_height
+            fresh_continuation = False
+
+        table_y = page.finish()
 
         new_y = table_y - self.settings.SPACING_LARGE
-        total_vat = subtotal * (vat_rate / Decimal('100'))
-        
-        return subtotal, total_vat, new_y 
\ No newline at end of file
+        totals = accumulator.result()
+
+        return totals.subtotal, totals.vat_amount, new_y
+
+    def layout_description(self, number: str, text: str) -> tuple:
+        """
+        Wrap a numbered description to the description column
+
+        Returns:
+            tuple: (wrapped lines or Paragraph, row height)
+        """
+        if not self.fast_path or "<" in text or "&" in text:
+            paragraph = self.make_paragraph(f"{number} {text}")
+            _, height = paragraph.wrap(self.description_width, self.settings.PAGE_HEIGHT)
+            return paragraph, max(height, self.CELL_LEADING) + self.CELL_PADDING * 2
+
+        return self.wrap_description(number, text)
+
+    def wrap_description(self, number: str, text: str) -> tuple:
+        """
+        Wrap a numbered plain-text description into lines drawn directly on the canvas
+
+        Returns:
+            tuple: (wrapped lines, row height)
+        """
+        # The number is wrapped as a leading word so the cached layout is shared by rows with equally wide numbers
+        font_name, font_size = self.settings.NORMAL_FONT, self.settings.FONT_SIZE_SMALL
+        lines, height = self.layout_cache.wrap(
+            text,
+            font_name,
+            font_size,
+            self.description_width,
+            self.CELL_LEADING,
+            lead_width=stringWidth(number, font_name, font_size),
+        )
+        first_line = f"{number} {lines[0]}" if lines and lines[0] else number
+        return [first_line, *lines[1:]], height + self.CELL_PADDING * 2
+
+    def split_description(self, description, height: float) -> Optional[tuple]:
+        """
+        Split a laid-out description so that its first part fits in a row of the given height
+
+        Returns:
+            tuple: (first part, its row height, rest, rest row height), or None when
+                not even one line fits
+        """
+        text_height = height - self.CELL_PADDING * 2
+        if isinstance(description, list):
+            count = int(text_height // self.CELL_LEADING)
+            if count < 1:
+                return None
+            piece, rest = description[:count], description[count:]
+            return (
+                piece,
+                len(piece) * self.CELL_LEADING + self.CELL_PADDING * 2,
+                rest,
+                len(rest) * self.CELL_LEADING + self.CELL_PADDING * 2,
+            )
+
+        parts = description.split(self.description_width, text_height)
+        if len(parts) < 2:
+            return None
+        heights = [
+            max(part.wrap(self.description_width, self.settings.PAGE_HEIGHT)[1], self.CELL_LEADING) + self.CELL_PADDING * 2
+            for part in parts[:2]
+        ]
+        return parts[0], heights[0], parts[1], heights[1]
+
+    def make_paragraph(self, text: str) -> "Paragraph":
+        """Build a description paragraph with the shared style"""
+        from reportlab.platypus import Paragraph
+
+        return Paragraph(text, self.description_style)
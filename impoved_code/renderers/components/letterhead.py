@@ -0,0 +1,51 @@
+import hashlib
+from typing import Callable, Optional
+from reportlab.pdfgen import canvas
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.models.invoice_data import CompanyInfo, BankDetails
+
+
+class LetterheadCache:
+    """Records static letterhead regions once per document as PDF Form XObjects"""
+
+    def __init__(self, settings: InvoiceSettings):
+        self.settings = settings
+        # Settings do not change after the renderer compiles its layout plan
+        self.settings_fingerprint = settings.fingerprint()
+        self.forms_created = 0
+        self.forms_reused = 0
+
+    def form_name(
+        self, seller: Optional[CompanyInfo] = None, bank: Optional[BankDetails] = None, variant: str = "first"
+    ) -> str:
+        """
+        Form name derived from seller, bank, settings and page variant
+
+        Seller and bank are left out for variants that draw nothing invoice specific,
+        so such a form is shared by every invoice of a document.
+        """
+        parts = [variant, self.settings_fingerprint]
+        if seller is not None:
+            parts.append(seller.model_dump_json())
+        if bank is not None:
+            parts.append(bank.model_dump_json())
+        return "Letterhead" + hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def stamp(self, canvas_obj: canvas.Canvas, name: str, draw_static: Callable[[canvas.Canvas], None]):
+        """
+        Draw the letterhead by reference, recording it on first use
+
+        Args:
+            canvas_obj: Canvas for drawing
+            name: Form name from form_name, computed once per invoice
+            draw_static: Callback drawing the static regions onto the canvas
+        """
+        if canvas_obj.hasForm(name):
+            self.forms_reused += 1
+        else:
+            canvas_obj.beginForm(name)
+            draw_static(canvas_obj)
+            canvas_obj.endForm()
+            self.forms_created += 1
+
+        canvas_obj.doForm(name)
@@ -1,6 +1,8 @@
 from reportlab.pdfgen import canvas
 from decimal import Decimal
 from impoved_code.config.settings import InvoiceSettings
+from impoved_code.renderers.layout import compile_layout, draw_slots
+from impoved_code.services.formatting import get_formatter
 
 
 class TotalsRenderer:
@@ -8,6 +10,7 @@ class TotalsRenderer:
     
     def __init__(self, settings: InvoiceSettings):
         self.settings = settings
+        self.plan = compile_layout(settings)
 
     def draw(self, canvas_obj: canvas.Canvas, subtotal: Decimal, total_vat: Decimal, vat_rate: Decimal, currency: str, table_end_y: float) -> float:
         """
@@ -18,62 +21,19 @@ class TotalsRenderer:
             subtotal: Amount without VAT
             total_vat: VAT amount
             vat_rate: VAT rate
-            currency: Currency symbol
+            currency: Currency code
             table_end_y: Y coordinate of table end
             
         Returns:
             float: Y coordinate for next element
         """
-        total = subtotal + total_vat
-        totals_y = table_end_y
-
-        table_width, table_center_x = self.settings.get_table_layout()
-
-        totals_start_x = table_center_x + self.settings.TABLE_COL_WIDTHS[0]
-        totals_end_x = table_center_x + table_width
-
-        # Line above totals
-        canvas_obj.line(totals_start_x, totals_y, totals_end_x, totals_y)
-
-        # Amount without VAT
-        canvas_obj.setFont(self.settings.NORMAL_FONT, self.settings.FONT_SIZE_NORMAL)
-        canvas_obj.setFillColor(self.settings.PRIMARY_COLOR)
-        canvas_obj.drawString(
-            totals_start_x, totals_y - self.settings.SPACING_LARGE, f"Сума без ПДВ:"
-        )
-        
-        # VAT
-        canvas_obj.setFillColor(self.settings.TEXT_COLOR)
-        canvas_obj.drawString(
-            totals_start_x, totals_y - self.settings.SPACING_LARGE * 2, f"ПДВ {vat_rate}%:"
-        )
-
-        # Line before total
-        canvas_obj.line(
-            totals_start_x,
-            totals_y - self.settings.SPACING_LARGE * 2.5,
-            totals_end_x,
-            totals_y - self.settings.SPACING_LARGE * 2.5,
-        )
-
-        # Total
-        canvas_obj.setFont(self.settings.BOLD_FONT, self.settings.FONT_SIZE_SUBHEADER)
-        canvas_obj.drawString(
-            totals_start_x, totals_y - self.settings.SPACING_LARGE * 3.5, "Всього:"
-        )
-
-        # Amounts on the right
-        canvas_obj.setFont(self.settings.NORMAL_FONT, self.settings.FONT_SIZE_NORMAL)
-        canvas_obj.setFillColor(self.settings.TEXT_COLOR)
-        canvas_obj.drawRightString(
-            totals_end_x, totals_y - self.settings.SPACING_LARGE, f"{currency} {subtotal:.2f}"
-        )
-        canvas_obj.drawRightString(
-            totals_end_x, totals_y - self.settings.SPACING_LARGE * 2, f"{currency} {total_vat:.2f}"
-        )
-        canvas_obj.setFont(self.settings.BOLD_FONT, self.settings.FONT_SIZE_SUBHEADER)
-        canvas_obj.drawRightString(
-            totals_end_x, totals_y - self.settings.SPACING_LARGE * 3.5, f"{currency} {total:.2f}"
-        )
-
-        return totals_y - self.settings.SPACING_LARGE * 4 
\ No newline at end of file
+        formatter = get_formatter(currency, self.settings.LOCALE)
+        values = {
+            "vat_rate": formatter.format_percent(vat_rate),
+            "subtotal": formatter.format(subtotal),
+            "vat_amount": formatter.format(total_vat),
+            "total": formatter.format(subtotal + total_vat),
+        }
+        draw_slots(canvas_obj, self.plan.totals, values, dy=table_end_y)
+
+        return table_end_y - self.plan.totals_height
@@ -1,121 +1,390 @@
+import io
 from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from typing import List
+from typing import Any, BinaryIO, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from impoved_code.config.settings import InvoiceSettings
-from impoved_code.config.currencies import CurrencyMapping
+from impoved_code.config.output_profiles import OutputProfile, get_profile
 from impoved_code.models.invoice_data import InvoiceData, LineItem
+from impoved_code.models.render_result import RenderResult
 from impoved_code.services.font_manager import FontManager
-from impoved_code.renderers.components.header import HeaderRenderer
-from impoved_code.renderers.components.company_info import CompanyInfoRenderer
+from impoved_code.services.instrumentation import NULL_PROBE, RenderCollector, RenderProbe
+from impoved_code.services.money import TotalsAccumulator
+from impoved_code.services.render_cache import RenderCache
 from impoved_code.renderers.components.items_table import ItemsTableRenderer
 from impoved_code.renderers.components.totals import TotalsRenderer
 from impoved_code.renderers.components.footer import FooterRenderer
+from impoved_code.renderers.components.letterhead import LetterheadCache
+from impoved_code.renderers.layout import compile_layout, draw_slots, invoice_values
+
+# Line items given separately from InvoiceData, e.g. a generator over a huge export
+LineItemSource = Iterable[Union[LineItem, Mapping[str, Any]]]
 
 
 class InvoiceRenderer:
 
     
-    def __init__(self):
-        self.settings = InvoiceSettings()
-        self.font_manager = FontManager()
+    def __init__(
+        self,
+        use_letterhead_forms: Optional[bool] = None,
+        render_cache: Optional[RenderCache] = None,
+        collector: Optional[RenderCollector] = None,
+        output_profile: Union[str, OutputProfile] = "default",
+        settings: Optional[InvoiceSettings] = None,
+    ):
+        # Layout constants; subclasses of InvoiceSettings override them as class attributes
+        self.settings = settings or InvoiceSettings()
+        # Geometry of every section, compiled once per settings
+        self.plan = compile_layout(self.settings)
+        # Only the faces the layout uses are parsed and embedded
+        self.font_manager = FontManager(font_names=self.settings.get_font_names())
         
         # Rendering components
-        self.header_renderer = HeaderRenderer(self.settings)
-        self.company_renderer = CompanyInfoRenderer(self.settings)
         self.table_renderer = ItemsTableRenderer(self.settings)
         self.totals_renderer = TotalsRenderer(self.settings)
         self.footer_renderer = FooterRenderer(self.settings)
 
-    def render(self, invoice_data: InvoiceData, filename: str) -> None:
+        # Static letterhead recorded once per document and stamped by reference. A form only
+        # pays off when several invoices share the document, so None uses forms in
+        # statements and draws the letterhead directly on single invoices
+        self.use_letterhead_forms = use_letterhead_forms
+        self.letterhead_cache = LetterheadCache(self.settings)
+        self._continuation_form_name = self.letterhead_cache.form_name(variant="continuation")
+
+        # Previously rendered documents, consulted before drawing anything
+        self.render_cache = render_cache
+
+        # Receives per-stage timings of every render; None disables instrumentation
+        self.collector = collector
+
+        # Compression and font embedding of the written PDF: "default", "fastest" or "smallest"
+        self.output_profile = get_profile(output_profile)
+
+        # PNG preview renderer, built on first render_preview call
+        self._preview = None
+
+    def render(
+        self, invoice_data: InvoiceData, filename: Union[str, BinaryIO], line_items: Optional[LineItemSource] = None
+    ) -> None:
         """
         Render invoice
         
         Args:
             invoice_data: Invoice data
-            filename: Filename for saving
+            filename: Filename or writable binary stream for saving
+            line_items: Line items drawn instead of invoice_data.line_items, see render_to_bytes
         """
-        self.font_manager.register_times_fonts()
+        _write_output(filename, self.render_to_bytes(invoice_data, line_items))
+
+    def render_to_bytes(self, invoice_data: InvoiceData, line_items: Optional[LineItemSource] = None) -> bytes:
+        """
+        Render invoice in memory
+        
+        Args:
+            invoice_data: Invoice data
+            line_items: Line items drawn instead of invoice_data.line_items. Any iterable works,
+                e.g. a generator over a database cursor: it is consumed once, mappings are
+                validated row by row and only the rows of the current page are kept, with
+                totals accumulated on the way. Such renders bypass the render cache.
+            
+        Returns:
+            bytes: PDF document
+        """
+        probe = self._probe(invoice_data.invoice_number)
+        if line_items is not None:
+            return self._draw_and_save(invoice_data, probe, LineItem.iter_validate(line_items))
+        if self.render_cache is None:
+            return self._draw_and_save(invoice_data, probe)
 
-        canvas_obj = canvas.Canvas(filename, pagesize=self.settings.PAGE_SIZE)
-        width, height = self.settings.PAGE_WIDTH, self.settings.PAGE_HEIGHT
+        key = self._cache_key(invoice_data)
+        content = self.render_cache.get(key)
+        if content is None:
+            content = self._draw_and_save(invoice_data, probe)
+            self.render_cache.put(key, content)
+        else:
+            probe.lap("cache")
+            probe.finish(len(content), cached=True)
+        return content
 
-        currency_symbol = CurrencyMapping.get_symbol(invoice_data.currency)
-        company_start_y = self.header_renderer.draw_logo(canvas_obj, height)
+    def render_to_stream(
+        self, invoice_data: InvoiceData, stream: BinaryIO, line_items: Optional[LineItemSource] = None
+    ) -> int:
+        """
+        Render invoice into a caller-supplied writable stream
         
-        self.company_renderer.draw_seller(canvas_obj, invoice_data.seller, company_start_y)
-        self.company_renderer.draw_bank_details(canvas_obj, invoice_data.bank, company_start_y)
-        self.company_renderer.draw_buyer(canvas_obj, invoice_data.buyer, company_start_y)
+        Args:
+            invoice_data: Invoice data
+            stream: Writable binary stream
+            line_items: Line items drawn instead of invoice_data.line_items, see render_to_bytes
+            
+        Returns:
+            int: Number of bytes written
+        """
+        content = self.render_to_bytes(invoice_data, line_items)
+        stream.write(content)
+        return len(content)
+
+    def iter_render_chunks(self, invoice_data: InvoiceData, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Render invoice as a sequence of chunks for streaming responses
         
-        self._draw_invoice_header(canvas_obj, invoice_data.invoice_number, company_start_y)
-        self._draw_invoice_details(canvas_obj, invoice_data.invoice_date, invoice_data.due_date, invoice_data.source, company_start_y)
+        Args:
+            invoice_data: Invoice data
+            chunk_size: Maximum size of a chunk in bytes
+            
+        Yields:
+            bytes: Consecutive parts of the PDF document
+        """
+        content = memoryview(self.render_to_bytes(invoice_data))
+        for offset in range(0, len(content), chunk_size):
+            yield bytes(content[offset:offset + chunk_size])
+
+    def render_preview(
+        self, invoice_data: InvoiceData, dpi: float = 72, page: int = 1, line_items: Optional[LineItemSource] = None
+    ) -> bytes:
+        """
+        Render one page of the invoice as a low-resolution PNG, without building a PDF
         
-        subtotal, total_vat, table_end_y = self.table_renderer.draw(
-            canvas_obj, invoice_data.line_items, invoice_data.vat_rate, currency_symbol, company_start_y
-        )
+        Args:
+            invoice_data: Invoice data
+            dpi: Output resolution; 72 gives one pixel per point, 36 a thumbnail
+            page: Page to render, starting at 1
+            line_items: Line items drawn instead of invoice_data.line_items, see render_to_bytes
+            
+        Returns:
+            bytes: PNG image
+        """
+        if self._preview is None:
+            # Imported here so PDF-only callers never load Pillow's drawing modules
+            from impoved_code.renderers.preview import PreviewRenderer
+
+            self._preview = PreviewRenderer(self.settings)
+        return self._preview.render_png(invoice_data, dpi, page, line_items)
+
+    def render_statement(
+        self, invoices: Iterable[InvoiceData], filename: Union[str, BinaryIO], bookmarks: bool = True
+    ) -> None:
+        """
+        Render several invoices into one PDF with shared fonts and letterhead
         
-        totals_end_y = self.totals_renderer.draw(
-            canvas_obj, subtotal, total_vat, invoice_data.vat_rate, currency_symbol, table_end_y
-        )
+        Args:
+            invoices: Invoices in output order
+            filename: Filename or writable binary stream for saving
+            bookmarks: Add an outline entry per invoice number
+        """
+        _write_output(filename, self.render_statement_to_bytes(invoices, bookmarks))
+
+    def render_statement_to_bytes(self, invoices: Iterable[InvoiceData], bookmarks: bool = True) -> bytes:
+        """
+        Render several invoices into one PDF in memory
         
-        self.footer_renderer.draw_payment_communication(canvas_obj, invoice_data.invoice_number, totals_end_y)
-        self.footer_renderer.draw_footer(canvas_obj, width)
+        Args:
+            invoices: Invoices in output order
+            bookmarks: Add an outline entry per invoice number
+            
+        Returns:
+            bytes: PDF document
+        """
+        probe = self._probe()
+        canvas_obj, count = self._draw_statement(invoices, io.BytesIO(), bookmarks, probe)
+        return self._save(canvas_obj, probe, invoices=count)
 
-        # Save file
-        canvas_obj.save()
+    def render_many(
+        self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]], workers: Optional[int] = None, chunksize: int = 8
+    ) -> List[RenderResult]:
+        """
+        Render many invoices in parallel worker processes
+        
+        Workers render with this renderer's output profile, settings and letterhead
+        option. The render cache and collector stay in this process and are not used.
+        
+        Args:
+            jobs: Iterable of (invoice_data, filename) pairs; a None filename returns PDF bytes in the result
+            workers: Number of worker processes (defaults to CPU count)
+            chunksize: Number of invoices sent to a worker per task
+            
+        Returns:
+            List[RenderResult]: One result per job, in submission order
+        """
+        # Imported here to avoid a circular import
+        from impoved_code.services.batch_renderer import BatchRenderer
 
-    def _draw_invoice_header(self, canvas_obj: canvas.Canvas, invoice_number: str, start_y: float):
-        """Draw invoice header"""
-        _, table_center_x = self.settings.get_table_layout()
+        return BatchRenderer(
+            workers=workers,
+            chunksize=chunksize,
+            output_profile=self.output_profile,
+            settings=self.settings,
+            use_letterhead_forms=self.use_letterhead_forms,
+        ).render_many(jobs)
 
-        canvas_obj.setFont(self.settings.TITLE_FONT, self.settings.FONT_SIZE_HEADER)
-        canvas_obj.setFillColor(self.settings.PRIMARY_COLOR)
-        canvas_obj.drawString(
-            table_center_x,
-            start_y - self.settings.SECTION_INVOICE_OFFSET,
-            f"Рахунок-фактура {invoice_number}",
+    def _cache_key(self, invoice_data: InvoiceData) -> str:
+        """Render cache key covering invoice data, settings, fonts and renderer options"""
+        options = (
+            f"letterhead={self._letterhead_forms(statement=False)};fast_path={self.table_renderer.fast_path};"
+            f"profile={tuple(self.output_profile)}"
+        )
+        return self.render_cache.make_key(
+            invoice_data, (self.settings.fingerprint(), self.font_manager.fingerprint(), options)
         )
 
-    def _draw_invoice_details(self, canvas_obj: canvas.Canvas, invoice_date, due_date, source: str, start_y: float):
-        """Draw invoice details"""
-        table_width, table_center_x = self.settings.get_table_layout()
+    def _letterhead_forms(self, statement: bool) -> bool:
+        """Whether the letterhead is stamped as a form in a single invoice or a statement"""
+        if self.use_letterhead_forms is None:
+            return statement
+        return self.use_letterhead_forms
 
-        canvas_obj.setFillColor(self.settings.TEXT_COLOR)
+    def _probe(self, invoice_number: Optional[str] = None):
+        """Stage probe reporting to the collector, or a no-op stand-in when instrumentation is off"""
+        if self.collector is None:
+            return NULL_PROBE
+        return RenderProbe(self.collector, invoice_number, self.output_profile.name)
 
-        canvas_obj.setFont(self.settings.BOLD_FONT, self.settings.FONT_SIZE_NORMAL)
-        canvas_obj.drawString(
-            table_center_x, start_y - self.settings.SECTION_DETAILS_OFFSET, "Дата:"
-        )
-        canvas_obj.drawString(
-            table_center_x + table_width / 3,
-            start_y - self.settings.SECTION_DETAILS_OFFSET,
-            "Термін оплати:",
-        )
-        canvas_obj.drawString(
-            table_center_x + table_width * 2 / 3,
-            start_y - self.settings.SECTION_DETAILS_OFFSET,
-            "Джерело:",
+    def _draw_and_save(self, invoice_data: InvoiceData, probe, line_items: Optional[Iterable[LineItem]] = None) -> bytes:
+        """Draw one invoice on a new canvas and return the finished document"""
+        canvas_obj = self._new_canvas(io.BytesIO(), probe)
+        self._draw_invoice(canvas_obj, invoice_data, probe, line_items, self._letterhead_forms(statement=False))
+        return self._save(canvas_obj, probe)
+
+    def _save(self, canvas_obj: canvas.Canvas, probe, invoices: int = 1) -> bytes:
+        """Serialize the canvas, timing compression and writing as the save stage"""
+        pages = canvas_obj.getPageNumber()
+        content = canvas_obj.getpdfdata()
+        probe.lap("save")
+        probe.finish(len(content), pages=pages, invoices=invoices)
+        return content
+
+    def _draw_statement(
+        self, invoices: Iterable[InvoiceData], target: Union[str, BinaryIO], bookmarks: bool, probe=NULL_PROBE
+    ) -> Tuple[canvas.Canvas, int]:
+        """
+        Draw a sequence of invoices on one canvas without saving it
+        
+        Returns:
+            tuple: (canvas, number of invoices drawn)
+        """
+        canvas_obj = self._new_canvas(target, probe)
+        letterhead_forms = self._letterhead_forms(statement=True)
+
+        count = 0
+        for index, invoice_data in enumerate(invoices):
+            if index:
+                probe.page_break(canvas_obj)
+                canvas_obj.showPage()
+
+            # Outline entry pointing at the first page of the invoice
+            if bookmarks:
+                key = f"invoice-{index}"
+                canvas_obj.bookmarkPage(key)
+                canvas_obj.addOutlineEntry(f"Рахунок-фактура {invoice_data.invoice_number}", key, level=0)
+
+            self._draw_invoice(canvas_obj, invoice_data, probe, letterhead_forms=letterhead_forms)
+            count += 1
+
+        if bookmarks:
+            canvas_obj.showOutline()
+
+        return canvas_obj, count
+
+    def _new_canvas(self, target: Union[str, BinaryIO], probe=NULL_PROBE) -> canvas.Canvas:
+        """Create a canvas with fonts registered and the output profile applied"""
+        self.font_manager.register_times_fonts()
+        canvas_obj = canvas.Canvas(
+            target, pagesize=self.settings.PAGE_SIZE, pageCompression=self.output_profile.page_compression
         )
+        # Read by the font faces when they embed their subsets
+        canvas_obj._doc.output_profile = self.output_profile
+        probe.lap("fonts", canvas_obj)
+        return canvas_obj
+
+    def _draw_invoice(
+        self,
+        canvas_obj: canvas.Canvas,
+        invoice_data: InvoiceData,
+        probe=NULL_PROBE,
+        line_items: Optional[Iterable[LineItem]] = None,
+        letterhead_forms: bool = False,
+    ):
+        """Draw one invoice starting on the current page, stamping the letterhead as a form if asked"""
+        company_start_y = self.plan.company_y
+        values = invoice_values(invoice_data)
 
-        canvas_obj.setFont(self.settings.NORMAL_FONT, self.settings.FONT_SIZE_NORMAL)
+        # Static regions: logo, seller, bank, labels and footer
+        if letterhead_forms:
+            self.letterhead_cache.stamp(
+                canvas_obj,
+                self.letterhead_cache.form_name(invoice_data.seller, invoice_data.bank),
+                lambda form_canvas: draw_slots(form_canvas, self.plan.letterhead, values),
+            )
+        else:
+            draw_slots(canvas_obj, self.plan.letterhead, values)
+        probe.lap("letterhead", canvas_obj)
+
+        draw_slots(canvas_obj, self.plan.buyer, values)
+        probe.lap("company_info", canvas_obj)
         
-        # Convert date objects to strings
-        invoice_date_str = invoice_date.strftime("%d.%m.%Y") if hasattr(invoice_date, 'strftime') else str(invoice_date)
-        due_date_str = due_date.strftime("%d.%m.%Y") if hasattr(due_date, 'strftime') else str(due_date)
+        draw_slots(canvas_obj, self.plan.invoice_title, values)
+        draw_slots(canvas_obj, self.plan.details, values)
+        probe.lap("header", canvas_obj)
         
-        canvas_obj.drawString(
-            table_center_x,
-            start_y - self.settings.SECTION_DETAILS_OFFSET - self.settings.SPACING_LARGE,
-            invoice_date_str,
+        def new_page(page_canvas: canvas.Canvas) -> float:
+            probe.page_break(page_canvas)
+            return self._start_continuation_page(page_canvas, invoice_data, letterhead_forms)
+
+        # Line, VAT and total amounts are computed while the rows are drawn
+        accumulator = TotalsAccumulator(invoice_data.vat_rate, invoice_data.currency, keep_lines=False)
+        subtotal, total_vat, table_end_y = self.table_renderer.draw(
+            canvas_obj,
+            invoice_data.line_items if line_items is None else line_items,
+            invoice_data.vat_rate,
+            invoice_data.currency,
+            company_start_y,
+            new_page,
+            accumulator,
         )
-        canvas_obj.drawString(
-            table_center_x + table_width / 3,
-            start_y - self.settings.SECTION_DETAILS_OFFSET - self.settings.SPACING_LARGE,
-            due_date_str,
+        probe.lap("items_table", canvas_obj)
+
+        # Totals and payment purpose stay together above the footer
+        totals_height = self.settings.SPACING_LARGE * 5 + self.settings.SPACING_SMALL
+        if table_end_y - totals_height < self.settings.MARGIN_BOTTOM:
+            table_end_y = new_page(canvas_obj)
+        
+        totals_end_y = self.totals_renderer.draw(
+            canvas_obj, subtotal, total_vat, invoice_data.vat_rate, invoice_data.currency, table_end_y
         )
-        canvas_obj.drawString(
-            table_center_x + table_width * 2 / 3,
-            start_y - self.settings.SECTION_DETAILS_OFFSET - self.settings.SPACING_LARGE,
-            source,
-        ) 
+        probe.lap("totals", canvas_obj)
+        
+        self.footer_renderer.draw_payment_communication(canvas_obj, invoice_data.invoice_number, totals_end_y)
+        probe.lap("footer", canvas_obj)
+
+    def _start_continuation_page(
+        self, canvas_obj: canvas.Canvas, invoice_data: InvoiceData, letterhead_forms: bool = False
+    ) -> float:
+        """
+        Finish the current page and start a continuation page
+        
+        Returns:
+            float: Y coordinate where content continues
+        """
+        canvas_obj.showPage()
+
+        if letterhead_forms:
+            # Nothing invoice specific, so one form serves every continuation page
+            self.letterhead_cache.stamp(
+                canvas_obj,
+                self._continuation_form_name,
+                lambda form_canvas: draw_slots(form_canvas, self.plan.continuation_letterhead),
+            )
+        else:
+            draw_slots(canvas_obj, self.plan.continuation_letterhead)
+
+        draw_slots(canvas_obj, self.plan.continuation_title, {"invoice_number": invoice_data.invoice_number})
+
+        return self.plan.company_y - self.settings.SPACING_LARGE
+
 
+def _write_output(target: Union[str, BinaryIO], content: bytes):
+    """Write a finished document to a filename or writable binary stream"""
+    if isinstance(target, str):
+        with open(target, "wb") as output:
+            output.write(content)
+    else:
+        target.write(content)
@@ -0,0 +1,274 @@
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from impoved_code.config.settings import InvoiceSettings
+
+
+class TextSlot(NamedTuple):
+    """Positioned text; text is a str.format template when dynamic is set"""
+
+    x: float
+    y: float
+    text: str
+    font: str
+    size: float
+    color: tuple
+    align: str = "left"
+    dynamic: bool = False
+
+
+class LineSlot(NamedTuple):
+    """Positioned line drawn with the current stroke color"""
+
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+Slot = Union[TextSlot, LineSlot]
+
+
+class LayoutPlan(NamedTuple):
+    """
+    Geometry of an invoice compiled once from InvoiceSettings
+
+    Page sections hold absolute coordinates for the settings page size. The totals
+    and payment sections are relative to the end of the items table.
+    """
+
+    page_width: float
+    page_height: float
+    table_x: float
+    table_width: float
+    column_right_x: Tuple[float, ...]
+    company_y: float
+
+    logo: Tuple[Slot, ...]
+    seller: Tuple[Slot, ...]
+    bank: Tuple[Slot, ...]
+    buyer_header: Tuple[Slot, ...]
+    buyer: Tuple[Slot, ...]
+    invoice_title: Tuple[Slot, ...]
+    detail_labels: Tuple[Slot, ...]
+    details: Tuple[Slot, ...]
+    footer: Tuple[Slot, ...]
+    continuation_title: Tuple[Slot, ...]
+    totals: Tuple[Slot, ...]
+    totals_height: float
+    payment: Tuple[Slot, ...]
+
+    # Static regions of the first page and of continuation pages, drawn in one pass
+    letterhead: Tuple[Slot, ...]
+    continuation_letterhead: Tuple[Slot, ...]
+
+
+# Compiled plans by settings fingerprint
+_plans: Dict[str, LayoutPlan] = {}
+
+
+def compile_layout(settings: InvoiceSettings) -> LayoutPlan:
+    """Layout plan for the settings, compiled on first use and shared afterwards"""
+    key = settings.fingerprint()
+    plan = _plans.get(key)
+    if plan is None:
+        plan = _plans[key] = _compile(settings)
+    return plan
+
+
+def _text(
+    x: float, y: float, text: str, font: str, size: float, color: tuple, align: str = "left", dynamic: Optional[bool] = None
+) -> TextSlot:
+    return TextSlot(x, y, text, font, size, color, align, "{" in text if dynamic is None else dynamic)
+
+
+def _compile(s: InvoiceSettings) -> LayoutPlan:
+    table_width, table_x = s.get_table_layout()
+    height = s.PAGE_HEIGHT
+    company_y = height - s.SECTION_LOGO_OFFSET
+    buyer_x = table_x + table_width - 250
+
+    column_right_x = []
+    column_x = table_x
+    for column_width in s.TABLE_COL_WIDTHS:
+        column_x += column_width
+        column_right_x.append(column_x)
+
+    def company(x: float, prefix: str) -> Tuple[Slot, ...]:
+        lines = ("{%s_name}", "ЄДРПОУ: {%s_edprou}", "{%s_address}", "{%s_country}")
+        return tuple(
+            _text(x, company_y - s.SPACING_SMALL - s.SPACING_MEDIUM * row, line % prefix, s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR)
+            for row, line in enumerate(lines)
+        )
+
+    bank_y = company_y - s.SECTION_BANK_OFFSET
+    bank_lines = (
+        "Банк: {bank_name}",
+        "МФО: {bank_mfo}",
+        "Адреса: {bank_address}",
+        "SWIFT: {bank_swift}",
+        "IBAN: {bank_iban}",
+    )
+    details_y = company_y - s.SECTION_DETAILS_OFFSET
+    detail_x = (table_x, table_x + table_width / 3, table_x + table_width * 2 / 3)
+
+    totals_x = table_x + s.TABLE_COL_WIDTHS[0]
+    totals_end_x = table_x + table_width
+    step = s.SPACING_LARGE
+
+    plan = LayoutPlan(
+        page_width=s.PAGE_WIDTH,
+        page_height=height,
+        table_x=table_x,
+        table_width=table_width,
+        column_right_x=tuple(column_right_x),
+        company_y=company_y,
+        logo=(
+            _text(table_x, height - s.MARGIN_TOP, s.LOGO_TEXT, s.TITLE_FONT, s.FONT_SIZE_TITLE, s.PRIMARY_COLOR, dynamic=False),
+            LineSlot(table_x, height - s.MARGIN_TOP - 20, table_x + table_width, height - s.MARGIN_TOP - 20),
+        ),
+        seller=(
+            _text(table_x, company_y + s.SECTION_COMPANY_OFFSET, "Продавець:", s.BOLD_FONT, s.FONT_SIZE_SUBHEADER, s.PRIMARY_COLOR),
+            *company(table_x, "seller"),
+        ),
+        bank=(
+            _text(table_x, bank_y, "Банківські реквізити:", s.BOLD_FONT, s.FONT_SIZE_SMALL, s.PRIMARY_COLOR),
+            *(
+                _text(table_x, bank_y - step * row, line, s.NORMAL_FONT, s.FONT_SIZE_FOOTER, s.TEXT_COLOR)
+                for row, line in enumerate(bank_lines, 1)
+            ),
+        ),
+        buyer_header=(
+            _text(buyer_x, company_y + s.SECTION_COMPANY_OFFSET, "Покупець:", s.BOLD_FONT, s.FONT_SIZE_SUBHEADER, s.PRIMARY_COLOR),
+        ),
+        buyer=company(buyer_x, "buyer"),
+        invoice_title=(
+            _text(table_x, company_y - s.SECTION_INVOICE_OFFSET, "Рахунок-фактура {invoice_number}", s.TITLE_FONT, s.FONT_SIZE_HEADER, s.PRIMARY_COLOR),
+        ),
+        detail_labels=tuple(
+            _text(x, details_y, label, s.BOLD_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR)
+            for x, label in zip(detail_x, ("Дата:", "Термін оплати:", "Джерело:"))
+        ),
+        details=tuple(
+            _text(x, details_y - step, field, s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR)
+            for x, field in zip(detail_x, ("{invoice_date}", "{due_date}", "{source}"))
+        ),
+        footer=(
+            LineSlot(table_x, s.MARGIN_BOTTOM, table_x + table_width, s.MARGIN_BOTTOM),
+            _text(s.PAGE_WIDTH / 2, s.MARGIN_BOTTOM - 20, s.FOOTER_TEXT, s.NORMAL_FONT, s.FONT_SIZE_FOOTER, s.TEXT_COLOR, "centre", False),
+        ),
+        continuation_title=(
+            _text(table_x, company_y, "Рахунок-фактура {invoice_number} (продовження)", s.TITLE_FONT, s.FONT_SIZE_SUBHEADER, s.PRIMARY_COLOR),
+        ),
+        totals=(
+            LineSlot(totals_x, 0, totals_end_x, 0),
+            _text(totals_x, -step, "Сума без ПДВ:", s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.PRIMARY_COLOR),
+            _text(totals_x, -step * 2, "ПДВ {vat_rate}:", s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR),
+            LineSlot(totals_x, -step * 2.5, totals_end_x, -step * 2.5),
+            _text(totals_x, -step * 3.5, "Всього:", s.BOLD_FONT, s.FONT_SIZE_SUBHEADER, s.TEXT_COLOR),
+            _text(totals_end_x, -step, "{subtotal}", s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR, "right"),
+            _text(totals_end_x, -step * 2, "{vat_amount}", s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR, "right"),
+            _text(totals_end_x, -step * 3.5, "{total}", s.BOLD_FONT, s.FONT_SIZE_SUBHEADER, s.TEXT_COLOR, "right"),
+        ),
+        totals_height=step * 4,
+        payment=(
+            _text(table_x, -step, "Призначення платежу: ", s.NORMAL_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR),
+            _text(table_x + 135, -step, "{invoice_number}", s.BOLD_FONT, s.FONT_SIZE_NORMAL, s.TEXT_COLOR),
+        ),
+        letterhead=(),
+        continuation_letterhead=(),
+    )
+    return plan._replace(
+        letterhead=plan.logo + plan.seller + plan.bank + plan.buyer_header + plan.detail_labels + plan.footer,
+        continuation_letterhead=plan.logo + plan.footer,
+    )
+
+
+def draw_slots(canvas_obj, slots: Tuple[Slot, ...], values: Optional[Mapping[str, str]] = None, dx: float = 0.0, dy: float = 0.0):
+    """
+    Draw slots in order, filling in dynamic text
+
+    Works with any object providing the reportlab canvas drawing methods used here.
+
+    Args:
+        canvas_obj: Canvas for drawing
+        slots: Section of a layout plan
+        values: Values for dynamic text templates
+        dx: Horizontal offset applied to every slot
+        dy: Vertical offset applied to every slot
+    """
+    font = color = None
+    for slot in slots:
+        if slot.__class__ is LineSlot:
+            canvas_obj.line(slot.x1 + dx, slot.y1 + dy, slot.x2 + dx, slot.y2 + dy)
+            continue
+
+        if font != (slot.font, slot.size):
+            font = (slot.font, slot.size)
+            canvas_obj.setFont(slot.font, slot.size)
+        if color != slot.color:
+            color = slot.color
+            canvas_obj.setFillColor(color)
+
+        text = slot.text.format_map(values) if slot.dynamic else slot.text
+        if slot.align == "left":
+            canvas_obj.drawString(slot.x + dx, slot.y + dy, text)
+        elif slot.align == "right":
+            canvas_obj.drawRightString(slot.x + dx, slot.y + dy, text)
+        else:
+            canvas_obj.drawCentredString(slot.x + dx, slot.y + dy, text)
+
+
+def dry_run(slots: Tuple[Slot, ...], values: Optional[Mapping[str, str]] = None, dx: float = 0.0, dy: float = 0.0) -> List[Slot]:
+    """
+    Resolve slots to final positions and text without drawing anything
+
+    Returns:
+        List[Slot]: Slots with offsets applied and dynamic text filled in
+    """
+    placed = []
+    for slot in slots:
+        if slot.__class__ is LineSlot:
+            placed.append(LineSlot(slot.x1 + dx, slot.y1 + dy, slot.x2 + dx, slot.y2 + dy))
+        else:
+            text = slot.text.format_map(values) if slot.dynamic else slot.text
+            placed.append(slot._replace(x=slot.x + dx, y=slot.y + dy, text=text, dynamic=False))
+    return placed
+
+
+def company_values(prefix: str, company) -> Dict[str, str]:
+    """Template values of a CompanyInfo under a seller or buyer prefix"""
+    return {
+        f"{prefix}_name": company.name,
+        f"{prefix}_edprou": company.edprou,
+        f"{prefix}_address": company.address,
+        f"{prefix}_country": company.country,
+    }
+
+
+def bank_values(bank) -> Dict[str, str]:
+    """Template values of BankDetails"""
+    return {
+        "bank_name": bank.name,
+        "bank_mfo": bank.mfo,
+        "bank_address": bank.address,
+        "bank_swift": bank.swift,
+        "bank_iban": bank.iban,
+    }
+
+
+def format_date(value) -> str:
+    return value.strftime("%d.%m.%Y") if hasattr(value, "strftime") else str(value)
+
+
+def invoice_values(invoice_data) -> Dict[str, str]:
+    """Template values of every static-position field of an invoice"""
+    values = {
+        "invoice_number": invoice_data.invoice_number,
+        "invoice_date": format_date(invoice_data.invoice_date),
+        "due_date": format_date(invoice_data.due_date),
+        "source": invoice_data.source,
+    }
+    values.update(company_values("seller", invoice_data.seller))
+    values.update(company_values("buyer", invoice_data.buyer))
+    values.update(bank_values(invoice_data.bank))
+    return values
@@ -0,0 +1,287 @@
+import html
+import os
+import re
+import struct
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.models.invoice_data import InvoiceData, LineItem
+from impoved_code.renderers.components.items_table import ItemsTableRenderer
+from impoved_code.renderers.invoice_renderer import InvoiceRenderer, LineItemSource
+
+# One pixel per point: an A4 page is 595 x 842 pixels
+DEFAULT_PREVIEW_DPI = 72
+
+_MARKUP_TAG = re.compile(r"<[^>]*>")
+
+
+class _GlyphSet:
+    """
+    Glyph bitmaps of one face at one pixel size, rasterized on first use
+
+    FreeType runs the TrueType hinting program every time Pillow draws a string, which
+    costs more than a whole PDF render for a page of text, so each glyph is rasterized
+    once and then stamped. Advances come from the reportlab metrics, so glyphs land
+    where they do in the PDF.
+    """
+
+    def __init__(self, path: str, font_name: str, size: float, scale: float):
+        self.font = ImageFont.truetype(path, size * scale, layout_engine=ImageFont.Layout.BASIC)
+        self.font_name = font_name
+        self.size = size
+        self.scale = scale
+        # Character: (mask or None for blank glyphs, left bearing, top offset from the baseline, advance)
+        self.glyphs: Dict[str, tuple] = {}
+
+    def glyph(self, char: str) -> tuple:
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            glyph = self.glyphs[char] = self._rasterize(char)
+        return glyph
+
+    def width(self, text: str) -> float:
+        return stringWidth(text, self.font_name, self.size) * self.scale
+
+    def _rasterize(self, char: str) -> tuple:
+        advance = self.width(char)
+        left, top, right, bottom = self.font.getbbox(char, anchor="ls")
+        if right <= left or bottom <= top:
+            return None, 0, 0, advance
+        mask = Image.new("L", (right - left, bottom - top), 0)
+        ImageDraw.Draw(mask).text((-left, -top), char, font=self.font, fill=255, anchor="ls")
+        return mask, left, top, advance
+
+
+@lru_cache(maxsize=64)
+def _glyph_set(path: str, font_name: str, size: float, scale: float) -> _GlyphSet:
+    """Glyph set shared by every preview at the same resolution"""
+    return _GlyphSet(path, font_name, size, scale)
+
+
+class PreviewCanvas:
+    """
+    Raster stand-in for the reportlab canvas methods used by the layout plan and items table
+
+    Coordinates are PDF points with the origin at the bottom left, as on the PDF canvas.
+    Only the requested page is rasterized; drawing on other pages is skipped, so page
+    breaks and totals are the same as in the PDF.
+    """
+
+    def __init__(
+        self,
+        page_size: tuple,
+        dpi: float,
+        font_path: Callable[[str], str],
+        page: int = 1,
+    ):
+        """
+        Args:
+            page_size: Page width and height in points
+            dpi: Output resolution
+            font_path: Path of the TTF file of a registered font name
+            page: Page to rasterize, starting at 1
+        """
+        self.scale = dpi / 72.0
+        self.page_height = page_size[1]
+        self.size = (max(1, round(page_size[0] * self.scale)), max(1, round(page_size[1] * self.scale)))
+        self.font_path = font_path
+        self.page = page
+        self.image: Optional[Image.Image] = None
+
+        self._page_number = 1
+        self._draw: Optional[ImageDraw.ImageDraw] = None
+        self._font_key = None
+        self._glyphs: Optional[_GlyphSet] = None
+        self._fill = (0, 0, 0)
+        # reportlab's default line width of one point
+        self._line_width = max(1, round(self.scale))
+        self._start_page()
+
+    def _start_page(self):
+        if self._page_number == self.page:
+            self.image = Image.new("RGB", self.size, (255, 255, 255))
+            self._draw = ImageDraw.Draw(self.image)
+        else:
+            self._draw = None
+
+    def getPageNumber(self) -> int:
+        return self._page_number
+
+    def showPage(self):
+        self._page_number += 1
+        self._start_page()
+
+    def setFont(self, font_name: str, size: float):
+        key = (font_name, size)
+        if key != self._font_key:
+            self._font_key = key
+            self._glyphs = None
+
+    def setFillColor(self, color: tuple):
+        self._fill = tuple(round(channel * 255) for channel in color)
+
+    def drawString(self, x: float, y: float, text: str):
+        self._text(x, y, text, "left")
+
+    def drawRightString(self, x: float, y: float, text: str):
+        self._text(x, y, text, "right")
+
+    def drawCentredString(self, x: float, y: float, text: str):
+        self._text(x, y, text, "centre")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        if self._draw is not None:
+            self._draw.line(
+                (self._x(x1), self._y(y1), self._x(x2), self._y(y2)), fill=(0, 0, 0), width=self._line_width
+            )
+
+    def _text(self, x: float, y: float, text: str, align: str):
+        if self._draw is None:
+            return
+        if self._glyphs is None:
+            font_name, size = self._font_key
+            self._glyphs = _glyph_set(self.font_path(font_name), font_name, size, self.scale)
+
+        x = self._x(x)
+        if align == "right":
+            x -= self._glyphs.width(text)
+        elif align == "centre":
+            x -= self._glyphs.width(text) / 2
+        baseline = round(self._y(y))
+
+        glyph = self._glyphs.glyph
+        bitmap = self._draw.bitmap
+        for char in text:
+            mask, left, top, advance = glyph(char)
+            if mask is not None:
+                bitmap((round(x) + left, baseline + top), mask, fill=self._fill)
+            x += advance
+
+    def _x(self, x: float) -> float:
+        return x * self.scale
+
+    def _y(self, y: float) -> float:
+        return (self.page_height - y) * self.scale
+
+
+class _PreviewTableRenderer(ItemsTableRenderer):
+    """Items table drawn with canvas text only; markup in descriptions is shown as plain text"""
+
+    def layout_description(self, number: str, text: str) -> tuple:
+        if "<" in text or "&" in text:
+            text = html.unescape(_MARKUP_TAG.sub("", text))
+        return self.wrap_description(number, text)
+
+
+class PreviewRenderer:
+    """
+    Low-resolution PNG previews drawn from the same layout plan and components as the PDF
+
+    Nothing is compressed into a PDF and no font is embedded: text is rasterized
+    straight from the TTF files with FreeType.
+    """
+
+    def __init__(self, settings: Optional[InvoiceSettings] = None):
+        """
+        Args:
+            settings: Invoice settings (defaults to InvoiceSettings)
+        """
+        # Letterhead forms are a PDF feature, the preview draws the static regions directly
+        self.renderer = InvoiceRenderer(use_letterhead_forms=False, settings=settings)
+        self.renderer.table_renderer = _PreviewTableRenderer(self.renderer.settings)
+        self.settings = self.renderer.settings
+
+    def render_image(
+        self,
+        invoice_data: InvoiceData,
+        dpi: float = DEFAULT_PREVIEW_DPI,
+        page: int = 1,
+        line_items: Optional[LineItemSource] = None,
+    ) -> Image.Image:
+        """
+        Rasterize one page of an invoice
+
+        Args:
+            invoice_data: Invoice data
+            dpi: Output resolution; 72 gives one pixel per point, 36 a thumbnail
+            page: Page to rasterize, starting at 1
+            line_items: Line items drawn instead of invoice_data.line_items, see InvoiceRenderer.render_to_bytes
+
+        Returns:
+            Image.Image: RGB image of the page
+        """
+        if page < 1:
+            raise ValueError(f"Page numbers start at 1, got {page}")
+
+        # Line wrapping measures text with the reportlab font metrics
+        font_manager = self.renderer.font_manager
+        font_manager.register_times_fonts()
+
+        canvas_obj = PreviewCanvas(
+            self.settings.PAGE_SIZE,
+            dpi,
+            lambda font_name: os.path.join(font_manager.fonts_dir, font_manager.font_files[font_name]),
+            page,
+        )
+        self.renderer._draw_invoice(
+            canvas_obj, invoice_data, line_items=None if line_items is None else LineItem.iter_validate(line_items)
+        )
+        if canvas_obj.image is None:
+            raise ValueError(f"Invoice {invoice_data.invoice_number} has {canvas_obj.getPageNumber()} pages, not {page}")
+        return canvas_obj.image
+
+    def render_png(
+        self,
+        invoice_data: InvoiceData,
+        dpi: float = DEFAULT_PREVIEW_DPI,
+        page: int = 1,
+        line_items: Optional[LineItemSource] = None,
+    ) -> bytes:
+        """
+        Rasterize one page of an invoice into PNG bytes
+
+        Args:
+            invoice_data: Invoice data
+            dpi: Output resolution, see render_image
+            page: Page to rasterize, starting at 1
+            line_items: Line items drawn instead of invoice_data.line_items
+
+        Returns:
+            bytes: PNG image
+        """
+        return encode_png(self.render_image(invoice_data, dpi, page, line_items), dpi)
+
+
+def encode_png(image: Image.Image, dpi: float = DEFAULT_PREVIEW_DPI, compress_level: int = 1) -> bytes:
+    """
+    Encode an RGB image as PNG without per-row filtering
+
+    Pillow tries every PNG filter on every row, which takes longer than drawing the
+    preview; unfiltered rows of flat white paper compress just as well.
+    """
+    width, height = image.size
+    pixels = memoryview(image.tobytes())
+    stride = width * 3
+    # Every scanline starts with its filter type, 0 for none
+    scanlines = b"".join(
+        part for offset in range(0, height * stride, stride) for part in (b"\0", pixels[offset:offset + stride])
+    )
+    pixels_per_metre = round(dpi / 0.0254)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+            _png_chunk(b"pHYs", struct.pack(">IIB", pixels_per_metre, pixels_per_metre, 1)),
+            _png_chunk(b"IDAT", zlib.compress(scanlines, compress_level)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
@@ -0,0 +1,181 @@
+import zipfile
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Union
+
+from impoved_code.config.output_profiles import OutputProfile
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.models.render_result import RenderResult
+from impoved_code.services.batch_renderer import BatchRenderer
+from impoved_code.services.bulk_pipeline import safe_filename, unique_filename
+
+
+class _ChunkBuffer:
+    """Write-only stream collecting ZIP output until it is drained"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class ZipArchiveSink:
+    """Writes rendered PDFs straight into ZIP entries of a file or stream"""
+
+    def __init__(
+        self,
+        target: Union[str, BinaryIO],
+        compression: int = zipfile.ZIP_STORED,
+        compresslevel: Optional[int] = None,
+        filename_template: str = "{invoice_number}.pdf",
+    ):
+        """
+        Args:
+            target: Filename or writable binary stream; the stream does not need to be seekable
+            compression: ZIP compression method; PDFs are already compressed, so entries are stored by default
+            compresslevel: Compression level for ZIP_DEFLATED and ZIP_BZIP2
+            filename_template: Entry name, formatted with the invoice number
+        """
+        self.filename_template = filename_template
+        self.zip_file = zipfile.ZipFile(target, "w", compression=compression, compresslevel=compresslevel)
+        self.names = set()
+        self.written = 0
+        self.failed: List[RenderResult] = []
+
+    def add(self, name: str, content: bytes) -> str:
+        """
+        Add one document
+
+        Returns:
+            str: Entry name, with a numeric suffix if the name was already used
+        """
+        name = self._unique_name(safe_filename(name))
+        self.zip_file.writestr(name, content)
+        self.written += 1
+        return name
+
+    def add_result(self, result: RenderResult) -> Optional[str]:
+        """Add a rendered batch result; failed results are kept in failed instead"""
+        if not result.success or result.content is None:
+            self.failed.append(result)
+            return None
+        name = self.filename_template.format(invoice_number=result.invoice_number or f"invoice-{result.index}")
+        return self.add(name, result.content)
+
+    def write_results(self, results: Iterable[RenderResult]) -> dict:
+        """
+        Add batch results one at a time as they arrive
+
+        Returns:
+            dict: Counters of written and failed documents with the failure messages
+        """
+        for result in results:
+            self.add_result(result)
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "failed": len(self.failed),
+            "errors": [
+                {"index": result.index, "invoice_number": result.invoice_number, "error": result.error}
+                for result in self.failed
+            ],
+        }
+
+    def close(self):
+        """Write the central directory"""
+        self.zip_file.close()
+
+    def __enter__(self) -> "ZipArchiveSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _unique_name(self, name: str) -> str:
+        return unique_filename(name, self.names)
+
+
+def render_zip(
+    invoices: Iterable[InvoiceData],
+    target: Union[str, BinaryIO],
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    compression: int = zipfile.ZIP_STORED,
+    filename_template: str = "{invoice_number}.pdf",
+    output_profile: Union[str, OutputProfile] = "default",
+) -> dict:
+    """
+    Render invoices into a ZIP archive without intermediate files
+
+    Each PDF is written to its entry as soon as it is rendered, so memory holds only
+    the documents still in flight between the workers and the archive.
+
+    Args:
+        invoices: Invoices to render
+        target: Filename or writable binary stream
+        workers: Number of worker processes (defaults to CPU count; 1 renders in this process)
+        chunksize: Number of invoices sent to a worker per task
+        compression: ZIP compression method
+        filename_template: Entry name, formatted with the invoice number
+        output_profile: Output profile of the rendered PDFs
+
+    Returns:
+        dict: Counters of written and failed documents with the failure messages
+    """
+    batch_renderer = BatchRenderer(workers=workers, chunksize=chunksize, output_profile=output_profile)
+    with ZipArchiveSink(target, compression=compression, filename_template=filename_template) as sink:
+        return sink.write_results(batch_renderer.iter_render((invoice_data, None) for invoice_data in invoices))
+
+
+def iter_render_zip(
+    invoices: Iterable[InvoiceData],
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    compression: int = zipfile.ZIP_STORED,
+    filename_template: str = "{invoice_number}.pdf",
+    chunk_size: int = 64 * 1024,
+    output_profile: Union[str, OutputProfile] = "default",
+) -> Iterator[bytes]:
+    """
+    Render invoices as a ZIP archive streamed in chunks, e.g. for a chunked HTTP response
+
+    Failed invoices are left out of the archive.
+
+    Args:
+        invoices: Invoices to render
+        workers: Number of worker processes (defaults to CPU count; 1 renders in this process)
+        chunksize: Number of invoices sent to a worker per task
+        compression: ZIP compression method
+        filename_template: Entry name, formatted with the invoice number
+        chunk_size: Maximum size of a yielded chunk in bytes
+        output_profile: Output profile of the rendered PDFs
+
+    Yields:
+        bytes: Consecutive parts of the ZIP archive
+    """
+    buffer = _ChunkBuffer()
+    batch_renderer = BatchRenderer(workers=workers, chunksize=chunksize, output_profile=output_profile)
+    sink = ZipArchiveSink(buffer, compression=compression, filename_template=filename_template)
+
+    for result in batch_renderer.iter_render((invoice_data, None) for invoice_data in invoices):
+        sink.add_result(result)
+        yield from _split(buffer.drain(), chunk_size)
+
+    sink.close()
+    yield from _split(buffer.drain(), chunk_size)
+
+
+def _split(data: bytes, chunk_size: int) -> Iterator[bytes]:
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
@@ -0,0 +1,247 @@
+import os
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Deque, Dict, Generator, Iterable, Iterator, List, Optional, Tuple, Union
+
+from impoved_code.config.output_profiles import OutputProfile
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.models.render_result import RenderResult
+from impoved_code.renderers.invoice_renderer import InvoiceRenderer
+
+Job = Tuple[int, InvoiceData, Optional[str]]
+
+# Renderer owned by the current worker process, created once by _init_worker
+_worker_renderer: Optional[InvoiceRenderer] = None
+
+
+def _init_worker(
+    output_profile: Union[str, OutputProfile] = "default",
+    settings: Optional[InvoiceSettings] = None,
+    use_letterhead_forms: Optional[bool] = None,
+):
+    """Create the per-process renderer and register fonts once"""
+    global _worker_renderer
+    _worker_renderer = InvoiceRenderer(
+        use_letterhead_forms=use_letterhead_forms, output_profile=output_profile, settings=settings
+    )
+    _worker_renderer.font_manager.register_times_fonts()
+
+
+def _worker_render_to_bytes(invoice_data: InvoiceData) -> bytes:
+    """Worker entry point: render one invoice to PDF bytes with the process renderer"""
+    if _worker_renderer is None:
+        _init_worker()
+    return _worker_renderer.render_to_bytes(invoice_data)
+
+
+def _worker_ping() -> int:
+    """Worker entry point used to start and initialize a worker ahead of traffic"""
+    if _worker_renderer is None:
+        _init_worker()
+    return os.getpid()
+
+
+def _render_one(renderer: InvoiceRenderer, index: int, invoice_data: InvoiceData, target) -> RenderResult:
+    """Render a single job, turning any exception into a failed result"""
+    invoice_number = getattr(invoice_data, "invoice_number", None)
+    target_name = None if target is None else str(target)
+    content = None
+    try:
+        if target is None:
+            content = renderer.render_to_bytes(invoice_data)
+        else:
+            renderer.render(invoice_data, target)
+    except Exception as exc:
+        return RenderResult(
+            index=index,
+            invoice_number=invoice_number,
+            target=target_name,
+            success=False,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return RenderResult(
+        index=index, invoice_number=invoice_number, target=target_name, success=True, content=content
+    )
+
+
+def _render_chunk(chunk: List[Job]) -> List[RenderResult]:
+    """Worker entry point: render a chunk of jobs with the process renderer"""
+    if _worker_renderer is None:
+        _init_worker()
+    return [_render_one(_worker_renderer, index, invoice_data, target) for index, invoice_data, target in chunk]
+
+
+class BatchRenderer:
+    """Renders many invoices in parallel across worker processes"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunksize: int = 8,
+        max_pending: Optional[int] = None,
+        output_profile: Union[str, OutputProfile] = "default",
+        settings: Optional[InvoiceSettings] = None,
+        use_letterhead_forms: Optional[bool] = None,
+    ):
+        """
+        Args:
+            workers: Number of worker processes (defaults to CPU count)
+            chunksize: Number of invoices sent to a worker per task
+            max_pending: Maximum number of chunks in flight (defaults to 2 per worker)
+            output_profile: Output profile of the rendered PDFs
+            settings: Layout settings of the worker renderers (defaults to InvoiceSettings);
+                sent to every worker, so custom settings classes must be importable there
+            use_letterhead_forms: Stamp the letterhead as a Form XObject, see InvoiceRenderer
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        self.max_pending = max_pending or self.workers * 2
+        self.output_profile = output_profile
+        self.settings = settings
+        self.use_letterhead_forms = use_letterhead_forms
+
+    def iter_render(self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]]) -> Iterator[RenderResult]:
+        """
+        Render jobs and yield results as they complete
+
+        Args:
+            jobs: Iterable of (invoice_data, target) pairs; a None target returns PDF bytes in the result
+
+        Yields:
+            RenderResult: Per-invoice result, in completion order
+        """
+        chunks = self._chunks(jobs)
+
+        if self.workers == 1:
+            renderer = InvoiceRenderer(
+                use_letterhead_forms=self.use_letterhead_forms, output_profile=self.output_profile, settings=self.settings
+            )
+            for chunk in chunks:
+                for index, invoice_data, target in chunk:
+                    yield _render_one(renderer, index, invoice_data, target)
+            return
+
+        executor = self._new_executor()
+        # Chunk of every submitted future and whether it runs alone in the pool
+        pending: Dict[Future, Tuple[List[Job], bool]] = {}
+        # Chunks of a crashed pool, rerun one at a time so a crash points at its chunk
+        suspects: Deque[List[Job]] = deque()
+        # Chunks that could not be submitted to a broken pool and never ran
+        ready: Deque[List[Job]] = deque()
+        exhausted = False
+        try:
+            while True:
+                broken = False
+                while not broken:
+                    if suspects:
+                        if pending:
+                            break
+                        chunk, alone = suspects.popleft(), True
+                    # Keep the number of submitted chunks bounded so huge job lists are not pickled up front
+                    elif len(pending) < self.max_pending and (ready or not exhausted):
+                        chunk, alone = ready.popleft() if ready else next(chunks, None), False
+                        if chunk is None:
+                            exhausted = True
+                            break
+                    else:
+                        break
+                    try:
+                        pending[executor.submit(_render_chunk, chunk)] = (chunk, alone)
+                    except BrokenProcessPool:
+                        # A worker died while idle; the chunk never ran
+                        if alone:
+                            suspects.appendleft(chunk)
+                        else:
+                            ready.appendleft(chunk)
+                        broken = True
+
+                if not broken:
+                    if not pending:
+                        return
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    broken = yield from self._collect(done, pending, suspects)
+                if broken:
+                    # A dead worker fails every chunk in flight; collect them all so no future
+                    # of the old pool is left to be mistaken for a crash of the new one
+                    done, _ = wait(pending)
+                    yield from self._collect(done, pending, suspects)
+                    executor = self._replace_executor(executor)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def render_many(self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]]) -> List[RenderResult]:
+        """
+        Render jobs and return results in submission order
+
+        Args:
+            jobs: Iterable of (invoice_data, target) pairs
+
+        Returns:
+            List[RenderResult]: One result per job
+        """
+        return sorted(self.iter_render(jobs), key=lambda result: result.index)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.output_profile, self.settings, self.use_letterhead_forms),
+        )
+
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Fresh pool in place of one whose worker died"""
+        broken.shutdown(wait=False, cancel_futures=True)
+        return self._new_executor()
+
+    def _collect(
+        self, done: Iterable[Future], pending: Dict[Future, Tuple[List[Job], bool]], suspects: Deque[List[Job]]
+    ) -> Generator[RenderResult, None, bool]:
+        """
+        Yield the results of finished chunks
+
+        A worker killed mid-chunk (segfault, OOM killer) breaks the whole pool, and every
+        chunk in flight fails with BrokenProcessPool whether or not it caused the crash.
+        Those chunks are queued as suspects and rerun alone. A suspect that crashes the
+        pool again is split into single jobs, and a single job that does is reported as a
+        failed result, so each job runs at most three times.
+
+        Returns:
+            bool: Whether the pool is broken and must be replaced
+        """
+        broken = False
+        for future in done:
+            chunk, alone = pending.pop(future)
+            try:
+                results = future.result()
+            except (BrokenProcessPool, CancelledError) as exc:
+                broken = True
+                if not alone:
+                    suspects.append(chunk)
+                    continue
+                if len(chunk) > 1:
+                    suspects.extend([job] for job in chunk)
+                    continue
+                results = [
+                    RenderResult(
+                        index=index,
+                        invoice_number=getattr(invoice_data, "invoice_number", None),
+                        target=None if target is None else str(target),
+                        success=False,
+                        error=f"WorkerExited: {exc}",
+                    )
+                    for index, invoice_data, target in chunk
+                ]
+            yield from results
+        return broken
+
+    def _chunks(self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]]) -> Iterator[List[Job]]:
+        """Split jobs into numbered chunks"""
+        numbered = ((index, invoice_data, target) for index, (invoice_data, target) in enumerate(jobs))
+        while True:
+            chunk = list(islice(numbered, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,311 @@
+import argparse
+import csv
+import json
+import os
+import queue
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+from pydantic import ValidationError
+
+from impoved_code.config.output_profiles import PROFILES, OutputProfile
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.services.batch_renderer import BatchRenderer
+
+
+# Column prefixes of the flat CSV layout and the nested InvoiceData fields they fill
+CSV_GROUPS = {
+    "seller_": "seller",
+    "buyer_": "buyer",
+    "bank_": "bank",
+}
+CSV_ITEM_PREFIX = "item_"
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]+")
+
+# Marks the end of the validated-record queue
+_END = object()
+
+
+def safe_filename(name: str) -> str:
+    """File name with path separators and other unsafe characters replaced"""
+    return _UNSAFE_FILENAME_CHARS.sub("_", name)
+
+
+def unique_filename(name: str, names: Set[str]) -> str:
+    """
+    File name not in names, with a numeric suffix before the extension if needed
+
+    The returned name is added to names.
+    """
+    if name not in names:
+        names.add(name)
+        return name
+
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        stem, suffix = name, ""
+    counter = 2
+    while True:
+        candidate = f"{stem}-{counter}{dot}{suffix}"
+        if candidate not in names:
+            names.add(candidate)
+            return candidate
+        counter += 1
+
+
+def read_jsonl(path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Lazily read JSONL lines
+
+    Lines are left unparsed so validation can read the JSON directly.
+
+    Yields:
+        tuple: (line number, raw line)
+    """
+    with open(path, encoding="utf-8") as source:
+        for line_number, line in enumerate(source, 1):
+            line = line.strip()
+            if line:
+                yield line_number, line
+
+
+def read_csv(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lazily read a flat CSV export with one row per line item
+
+    Consecutive rows with the same invoice_number form one invoice. Columns prefixed with
+    seller_, buyer_ and bank_ fill the nested company and bank details, columns prefixed
+    with item_ fill a line item, and the remaining columns are invoice fields.
+
+    Yields:
+        tuple: (line number of the first row, invoice record)
+    """
+    with open(path, encoding="utf-8", newline="") as source:
+        reader = csv.DictReader(source)
+        record = None
+        record_line = 0
+
+        for row in reader:
+            # Header is line 1, data rows start at line 2
+            line_number = reader.line_num
+            if record is not None and row.get("invoice_number") != record.get("invoice_number"):
+                yield record_line, record
+                record = None
+
+            if record is None:
+                record = _csv_invoice(row)
+                record_line = line_number
+
+            item = {key[len(CSV_ITEM_PREFIX):]: value for key, value in row.items() if key.startswith(CSV_ITEM_PREFIX)}
+            if any(item.values()):
+                record["line_items"].append(item)
+
+        if record is not None:
+            yield record_line, record
+
+
+def _csv_invoice(row: Dict[str, str]) -> Dict[str, Any]:
+    """Build the invoice part of a record from a CSV row"""
+    record: Dict[str, Any] = {field: {} for field in CSV_GROUPS.values()}
+    record["line_items"] = []
+
+    for key, value in row.items():
+        if key.startswith(CSV_ITEM_PREFIX):
+            continue
+        for prefix, field in CSV_GROUPS.items():
+            if key.startswith(prefix):
+                record[field][key[len(prefix):]] = value
+                break
+        else:
+            # Empty optional columns fall back to model defaults
+            if value != "":
+                record[key] = value
+    return record
+
+
+def _reject_record(record: Any) -> Any:
+    """Rejected record as parsed JSON where possible, otherwise unchanged"""
+    if isinstance(record, str):
+        try:
+            return json.loads(record)
+        except json.JSONDecodeError:
+            pass
+    return record
+
+
+class BulkPipeline:
+    """Streams invoice records through validation and rendering with bounded memory"""
+
+    def __init__(
+        self,
+        output_dir: str,
+        reject_path: str,
+        workers: Optional[int] = None,
+        queue_size: int = 64,
+        chunksize: int = 8,
+        filename_template: str = "{invoice_number}.pdf",
+        output_profile: Union[str, OutputProfile] = "default",
+    ):
+        """
+        Args:
+            output_dir: Directory for rendered PDFs
+            reject_path: JSONL file for records that failed validation or rendering
+            workers: Number of rendering processes (defaults to CPU count)
+            queue_size: Maximum number of validated invoices waiting for rendering
+            chunksize: Number of invoices sent to a worker per task
+            filename_template: Output file name, formatted with invoice fields
+            output_profile: Output profile of the rendered PDFs
+        """
+        self.output_dir = output_dir
+        self.reject_path = reject_path
+        self.queue_size = queue_size
+        self.filename_template = filename_template
+        self.batch_renderer = BatchRenderer(workers=workers, chunksize=chunksize, output_profile=output_profile)
+
+    def run_jsonl(self, path: str) -> dict:
+        """Render every invoice of a JSONL file"""
+        return self.run(read_jsonl(path))
+
+    def run_csv(self, path: str) -> dict:
+        """Render every invoice of a flat CSV file"""
+        return self.run(read_csv(path))
+
+    def run(self, records: Iterable[Tuple[int, Any]]) -> dict:
+        """
+        Validate and render records
+
+        Args:
+            records: Iterable of (source line number, JSON text or record dict)
+
+        Returns:
+            dict: Counters of read, rendered and rejected records
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        stats = {"read": 0, "rendered": 0, "rejected": 0, "failed": 0, "renamed": 0}
+        validated = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        stop = threading.Event()
+
+        with open(self.reject_path, "w", encoding="utf-8") as reject_file:
+            reject_lock = threading.Lock()
+
+            def reject(entry: dict):
+                with reject_lock:
+                    reject_file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+            producer = threading.Thread(
+                target=self._validate_stage,
+                args=(records, validated, reject, stats, errors, stop),
+                daemon=True,
+            )
+            producer.start()
+
+            # Source line numbers of jobs in flight, by batch index
+            job_lines: Dict[int, int] = {}
+            try:
+                for result in self.batch_renderer.iter_render(self._render_jobs(validated, job_lines, stats)):
+                    line_number = job_lines.pop(result.index, None)
+                    if result.success:
+                        stats["rendered"] += 1
+                    else:
+                        stats["failed"] += 1
+                        reject(
+                            {
+                                "line": line_number,
+                                "stage": "render",
+                                "invoice_number": result.invoice_number,
+                                "error": result.error,
+                            }
+                        )
+            finally:
+                # Unblock the producer if rendering stopped early
+                stop.set()
+                while producer.is_alive():
+                    try:
+                        validated.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+                producer.join()
+
+        if errors:
+            raise errors[0]
+        return stats
+
+    def _validate_stage(self, records, validated: queue.Queue, reject, stats: dict, errors: list, stop: threading.Event):
+        """Producer thread: parse and validate records into the bounded queue"""
+        try:
+            for line_number, record in records:
+                if stop.is_set():
+                    return
+                stats["read"] += 1
+                try:
+                    if isinstance(record, str):
+                        invoice_data = InvoiceData.model_validate_json(record)
+                    elif isinstance(record, dict):
+                        invoice_data = InvoiceData.model_validate(record)
+                    else:
+                        raise ValueError("Record is not a JSON object")
+                except (ValidationError, ValueError) as exc:
+                    stats["rejected"] += 1
+                    reject({"line": line_number, "stage": "validation", "error": str(exc), "record": _reject_record(record)})
+                    continue
+                validated.put((line_number, invoice_data))
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            validated.put(_END)
+
+    def _render_jobs(
+        self, validated: queue.Queue, job_lines: Dict[int, int], stats: dict
+    ) -> Iterator[Tuple[InvoiceData, str]]:
+        """
+        Consume validated invoices as (invoice_data, target) jobs for the batch renderer
+
+        Every job gets its own file: an invoice whose file name was already used in this
+        run, e.g. a repeated invoice number or one that only differs in unsafe characters,
+        is written with a numeric suffix instead of overwriting the other file.
+        """
+        names: Set[str] = set()
+        index = 0
+        while True:
+            item = validated.get()
+            if item is _END:
+                return
+            line_number, invoice_data = item
+            job_lines[index] = line_number
+            index += 1
+            filename = self.output_filename(invoice_data)
+            unique = unique_filename(filename, names)
+            if unique != filename:
+                stats["renamed"] += 1
+            yield invoice_data, os.path.join(self.output_dir, unique)
+
+    def output_filename(self, invoice_data: InvoiceData) -> str:
+        """File name for an invoice with path separators and other unsafe characters replaced"""
+        return safe_filename(self.filename_template.format(**dict(invoice_data)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render invoices from a JSONL or CSV export")
+    parser.add_argument("input", help="JSONL or CSV file")
+    parser.add_argument("--output", default="invoices", help="Directory for rendered PDFs")
+    parser.add_argument("--rejects", default="rejects.jsonl", help="JSONL file for rejected records")
+    parser.add_argument("--workers", type=int, default=None, help="Number of rendering processes")
+    parser.add_argument("--queue-size", type=int, default=64, help="Maximum number of invoices waiting for rendering")
+    parser.add_argument("--profile", default="default", choices=sorted(PROFILES), help="Output profile")
+    args = parser.parse_args()
+
+    pipeline = BulkPipeline(
+        args.output, args.rejects, workers=args.workers, queue_size=args.queue_size, output_profile=args.profile
+    )
+    if args.input.lower().endswith(".csv"):
+        stats = pipeline.run_csv(args.input)
+    else:
+        stats = pipeline.run_jsonl(args.input)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
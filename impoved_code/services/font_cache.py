@@ -0,0 +1,126 @@
+import hashlib
+import os
+import pickle
+import stat
+from typing import Dict, Optional
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab import rl_config
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont
+
+from impoved_code.services.font_subset import ProfiledTTFontFace
+
+
+class FontCache:
+    """On-disk cache of parsed TrueType faces keyed by font file hash"""
+
+    # Bump when the layout of cached entries changes
+    CACHE_VERSION = 1
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or self.default_cache_dir()
+        # SHA-256 of every font file loaded through this cache, by path
+        self.digests: Dict[str, str] = {}
+
+    @staticmethod
+    def default_cache_dir() -> str:
+        """Cache directory from INVOICE_FONT_CACHE_DIR or the user cache directory"""
+        env_dir = os.environ.get("INVOICE_FONT_CACHE_DIR")
+        if env_dir:
+            return env_dir
+        base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base_dir, "impoved_code", "fonts")
+
+    def load_font(self, font_name: str, font_path: str) -> TTFont:
+        """
+        Build a TTFont, reusing parsed tables from the cache when possible
+        
+        Args:
+            font_name: Name to register the font under
+            font_path: Path to the TTF file
+            
+        Returns:
+            TTFont: Font ready for pdfmetrics.registerFont
+        """
+        with open(font_path, "rb") as font_file:
+            font_data = font_file.read()
+
+        digest = hashlib.sha256(font_data).hexdigest()
+        self.digests[font_path] = digest
+
+        cache_path = self._cache_path(font_path, digest)
+        face_state = self._read(cache_path)
+        if face_state is not None:
+            return self._build_font(font_name, face_state, font_data)
+
+        # Built from the parsed state as on a cache hit, so both paths return the same face class
+        face_state = {key: value for key, value in vars(TTFont(font_name, font_path).face).items() if key != "_ttf_data"}
+        self._write(cache_path, face_state)
+        return self._build_font(font_name, face_state, font_data)
+
+    def _cache_path(self, font_path: str, digest: str) -> str:
+        """Cache file name for a font: file hash plus cache and reportlab versions"""
+        base_name = os.path.splitext(os.path.basename(font_path))[0]
+        file_name = f"{base_name}-{digest[:32]}-v{self.CACHE_VERSION}-rl{reportlab.Version}.pkl"
+        return os.path.join(self.cache_dir, file_name)
+
+    def _read(self, cache_path: str) -> Optional[dict]:
+        """Load a cached face state, ignoring missing, unreadable or untrusted entries"""
+        try:
+            if not self._is_private(os.stat(self.cache_dir)):
+                return None
+            with open(cache_path, "rb") as cache_file:
+                if not self._is_private(os.fstat(cache_file.fileno())):
+                    return None
+                return pickle.load(cache_file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def _write(self, cache_path: str, face_state: dict):
+        """Store a face state atomically; the cache is best effort"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # Entries in a directory other users can write to would never be loaded
+            if not self._is_private(os.stat(self.cache_dir)):
+                return
+            # Not group writable even under a permissive umask, or _read would skip it
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as cache_file:
+                pickle.dump(face_state, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _is_private(file_stat: os.stat_result) -> bool:
+        """
+        Whether a cache file or directory belongs to the current user and nobody else can write to it
+
+        Entries are unpickled, which can run arbitrary code, so the cache is only used
+        when no other user could have planted or replaced them.
+        """
+        if not hasattr(os, "getuid"):
+            # No POSIX ownership on Windows; the user cache directory is per user
+            return True
+        return file_stat.st_uid == os.getuid() and not file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    @staticmethod
+    def _build_font(font_name: str, face_state: dict, font_data: bytes) -> TTFont:
+        """Recreate a TTFont from cached face state, mirroring TTFont.__init__"""
+        face = ProfiledTTFontFace.__new__(ProfiledTTFontFace)
+        face.__dict__.update(face_state)
+        # Raw file data is needed later for subsetting
+        face._ttf_data = font_data
+
+        font = TTFont.__new__(TTFont)
+        font.fontName = font_name
+        font.face = face
+        font.encoding = TTEncoding()
+        font.state = WeakKeyDictionary()
+        font._asciiReadable = rl_config.ttfAsciiReadable
+        return font
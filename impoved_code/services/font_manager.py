@@ -1,36 +1,88 @@
 # Перенесено
 
+import hashlib
 import os
+import threading
+from typing import Dict, Iterable, Optional
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+
+from impoved_code.services.font_cache import FontCache
+
+
+# Fonts bundled with the project, resolved independently of the working directory
+DEFAULT_FONTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "fonts")
+
+# Process-wide registry: fonts registered by any FontManager in this process, with their file hashes
+_registered_fonts: Dict[str, str] = {}
+_registry_lock = threading.Lock()
 
 
 class FontManager:
-    def __init__(self):
-        self.fonts_registered = False
-        self.fonts_dir = "fonts"
+    def __init__(
+        self,
+        fonts_dir: Optional[str] = None,
+        font_cache: Optional[FontCache] = None,
+        font_names: Optional[Iterable[str]] = None,
+    ):
+        """
+        Args:
+            fonts_dir: Directory with the TTF files
+            font_cache: Cache of parsed fonts
+            font_names: Faces registered by register_times_fonts (defaults to all of them);
+                other faces are registered on first register_font call
+        """
+        self.fonts_dir = fonts_dir or DEFAULT_FONTS_DIR
+        self.font_cache = font_cache or FontCache()
         self.font_files = {
             "Times": "TIMES.TTF",
             "Times-Bold": "TIMESBD.TTF",
             "Times-Italic": "TIMESI.TTF",
             "Times-BoldItalic": "TIMESBI.TTF",
         }
+        self.font_names = tuple(font_names) if font_names is not None else tuple(self.font_files)
+
+    @property
+    def fonts_registered(self) -> bool:
+        return all(font_name in _registered_fonts for font_name in self.font_names)
 
     def register_times_fonts(self):
         if self.fonts_registered:
             return
 
-        for font_name, font_file in self.font_files.items():
-            font_path = os.path.join(self.fonts_dir, font_file)
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont(font_name, font_path))
+        for font_name in self.font_names:
+            self.register_font(font_name)
+
+    def register_font(self, font_name: str) -> bool:
+        """
+        Register one face from the fonts directory if it is not registered yet
 
+        Returns:
+            bool: Whether the face is registered
+        """
+        if font_name in _registered_fonts:
+            return True
+
+        with _registry_lock:
+            if font_name in _registered_fonts:
+                return True
+
+            font_path = os.path.join(self.fonts_dir, self.font_files[font_name])
+            if not os.path.exists(font_path):
+                return False
+
+            pdfmetrics.registerFont(self.font_cache.load_font(font_name, font_path))
+            _registered_fonts[font_name] = self.font_cache.digests[font_path]
+            return True
 
-        self.fonts_registered = True
+    def fingerprint(self) -> str:
+        """Hash of the registered font files, used as a cache key"""
+        self.register_times_fonts()
+        versions = sorted((name, _registered_fonts.get(name, "")) for name in self.font_names)
+        return hashlib.sha256(repr(versions).encode("utf-8")).hexdigest()
 
     def is_font_available(self, font_name: str) -> bool:
         try:
             pdfmetrics.getFont(font_name)
             return True
         except:
-            return False 
\ No newline at end of file
+            return False
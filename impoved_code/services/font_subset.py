@@ -0,0 +1,143 @@
+import struct
+import zlib
+
+from reportlab.pdfbase.ttfonts import TTFontFace, TTFontMaker
+
+# Composite glyph flags
+_ARG_1_AND_2_ARE_WORDS = 0x0001
+_WE_HAVE_A_SCALE = 0x0008
+_MORE_COMPONENTS = 0x0020
+_WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+_WE_HAVE_A_TWO_BY_TWO = 0x0080
+_WE_HAVE_INSTRUCTIONS = 0x0100
+
+# Tables kept in a stripped subset; cvt, fpgm and prep only serve hinting
+# and name is not used by PDF viewers
+_KEPT_TABLES = ("OS/2", "post", "cmap", "hhea", "hmtx", "maxp")
+
+
+class _FlateFilter:
+    """FlateDecode stream filter with a chosen zlib level"""
+
+    pdfname = "FlateDecode"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def encode(self, text: bytes) -> bytes:
+        return zlib.compress(text, self.level)
+
+    def decode(self, encoded: bytes) -> bytes:
+        return zlib.decompress(encoded)
+
+
+class ProfiledTTFontFace(TTFontFace):
+    """
+    TrueType face that applies the output profile of the document to its subsets
+
+    The profile is read from the output_profile attribute of the reportlab document;
+    documents without one get reportlab's output unchanged.
+    """
+
+    def addSubsetObjects(self, doc, fontname, subset):
+        descriptor = super().addSubsetObjects(doc, fontname, subset)
+
+        profile = getattr(doc, "output_profile", None)
+        if profile is None:
+            return descriptor
+
+        # Same name addSubsetObjects registers the font program under
+        font_file = doc.idToObject["fontFile:%s(%s)" % (self.filename, fontname)]
+        if profile.strip_font_hinting:
+            font_file.content = strip_hinting(font_file.content)
+            font_file.dictionary["Length1"] = len(font_file.content)
+        if doc.compression:
+            font_file.filters = [_FlateFilter(profile.compression_level)]
+        return descriptor
+
+
+def strip_hinting(font_program: bytes) -> bytes:
+    """
+    Remove hinting tables and glyph instructions from a TrueType subset
+
+    Outlines and metrics are unchanged, so the text looks the same at print and
+    screen zoom levels; only grid fitting at small pixel sizes is lost.
+    """
+    tables = _read_tables(font_program)
+    head = tables["head"]
+    glyph_data = tables["glyf"]
+
+    if struct.unpack(">h", head[50:52])[0]:
+        offsets = struct.unpack(">%dL" % (len(tables["loca"]) // 4), tables["loca"])
+    else:
+        offsets = [offset * 2 for offset in struct.unpack(">%dH" % (len(tables["loca"]) // 2), tables["loca"])]
+
+    glyphs = []
+    new_offsets = [0]
+    position = 0
+    for start, end in zip(offsets, offsets[1:]):
+        glyph = _strip_glyph(glyph_data[start:end])
+        glyph += b"\0" * (-len(glyph) % 4)
+        glyphs.append(glyph)
+        position += len(glyph)
+        new_offsets.append(position)
+
+    output = TTFontMaker()
+    for tag in _KEPT_TABLES:
+        if tag in tables:
+            output.add(tag, tables[tag])
+    output.add("glyf", b"".join(glyphs))
+
+    if position >> 1 > 0xFFFF:
+        index_to_loc_format = 1
+        loca = struct.pack(">%dL" % len(new_offsets), *new_offsets)
+    else:
+        index_to_loc_format = 0
+        loca = struct.pack(">%dH" % len(new_offsets), *(offset >> 1 for offset in new_offsets))
+    output.add("loca", loca)
+    output.add("head", head[:50] + struct.pack(">h", index_to_loc_format) + head[52:])
+
+    return output.makeStream()
+
+
+def _read_tables(font_program: bytes) -> dict:
+    """Tables of a TrueType font by tag"""
+    count = struct.unpack(">H", font_program[4:6])[0]
+    tables = {}
+    for index in range(count):
+        entry = 12 + 16 * index
+        tag, _, offset, length = struct.unpack(">4sLLL", font_program[entry:entry + 16])
+        tables[tag.decode("latin-1")] = font_program[offset:offset + length]
+    return tables
+
+
+def _strip_glyph(glyph: bytes) -> bytes:
+    """Glyph record without its instructions"""
+    if not glyph:
+        return glyph
+
+    contours = struct.unpack(">h", glyph[:2])[0]
+    if contours >= 0:
+        # Simple glyph: header, end points, instruction length and instructions, then outline
+        position = 10 + 2 * contours
+        length = struct.unpack(">H", glyph[position:position + 2])[0]
+        return glyph[:position] + b"\0\0" + glyph[position + 2 + length:]
+
+    # Composite glyph: instructions, if any, follow the last component
+    position = 10
+    flags = _MORE_COMPONENTS
+    while flags & _MORE_COMPONENTS:
+        flags_position = position
+        flags = struct.unpack(">H", glyph[position:position + 2])[0]
+        position += 4
+        position += 4 if flags & _ARG_1_AND_2_ARE_WORDS else 2
+        if flags & _WE_HAVE_A_SCALE:
+            position += 2
+        elif flags & _WE_HAVE_AN_X_AND_Y_SCALE:
+            position += 4
+        elif flags & _WE_HAVE_A_TWO_BY_TWO:
+            position += 8
+
+    if not flags & _WE_HAVE_INSTRUCTIONS:
+        return glyph
+    return glyph[:flags_position] + struct.pack(">H", flags & ~_WE_HAVE_INSTRUCTIONS) + glyph[flags_position + 2:position]
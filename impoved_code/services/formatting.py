@@ -0,0 +1,108 @@
+import threading
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from impoved_code.config.currencies import CurrencyMapping
+from impoved_code.config.locales import LOCALES
+from impoved_code.services.money import to_minor_units
+
+DEFAULT_LOCALE = "uk_UA"
+
+
+class MoneyFormatter:
+    """
+    Formats amounts of one currency in one locale
+
+    Separators, symbol placement and the minor unit exponent are resolved once
+    when the formatter is built, so formatting a cell is a few string operations.
+    """
+
+    def __init__(self, currency: str, locale: str = DEFAULT_LOCALE):
+        """
+        Args:
+            currency: ISO 4217 currency code
+            locale: Key of LOCALES
+        """
+        try:
+            rules = LOCALES[locale]
+        except KeyError:
+            raise ValueError(f"Unknown locale {locale!r}, expected one of {', '.join(LOCALES)}") from None
+
+        self.currency = currency.upper()
+        self.locale = locale
+        self.exponent = CurrencyMapping.get_minor_units(self.currency)
+        self.symbol = CurrencyMapping.get_symbol(self.currency)
+        self.decimal = rules.decimal
+        self._group_separator = rules.group
+
+        self._scale = 10 ** self.exponent
+        # Python's "," grouping and "." decimal point mapped to the locale separators
+        self._separators = str.maketrans({",": rules.group, ".": rules.decimal})
+
+        if rules.symbol_first:
+            # Alphabetic symbols such as "CHF" or "zł" are always separated from the number
+            space = " " if rules.symbol_space or self.symbol[-1].isalpha() else ""
+            self._prefix, self._suffix = self.symbol + space, ""
+        else:
+            self._prefix, self._suffix = "", " " + self.symbol
+
+    def format_minor(self, units: int) -> str:
+        """Amount given in integer minor units, with the currency symbol"""
+        if units < 0:
+            return "-" + self.format_minor(-units)
+        whole, fraction = divmod(units, self._scale)
+        number = f"{whole:,}".replace(",", self._group_separator) if whole >= 1000 else str(whole)
+        if self.exponent:
+            return f"{self._prefix}{number}{self.decimal}{fraction:0{self.exponent}d}{self._suffix}"
+        return f"{self._prefix}{number}{self._suffix}"
+
+    def format(self, amount: Decimal) -> str:
+        """Amount rounded to the currency's minor unit, with the currency symbol"""
+        return self.format_minor(to_minor_units(amount, self.exponent))
+
+    def format_price(self, price: Decimal) -> str:
+        """
+        Unit price without the symbol
+
+        Shown with the currency's minor units, or with its own decimals when it is
+        more precise, e.g. 0.15 JPY per call.
+        """
+        places = self.exponent
+        exponent = Decimal(price).normalize().as_tuple().exponent
+        if isinstance(exponent, int) and -exponent > places:
+            places = min(-exponent, 8)
+        return self.format_number(price, places)
+
+    def format_percent(self, rate: Decimal) -> str:
+        """
+        Percentage such as a VAT rate, with the locale decimal separator
+
+        Trailing zeros are dropped: 20.0 is "20%" and 7.50 is "7,5%" in uk_UA. The C
+        locale prints the rate as given, as the original renderer did.
+        """
+        if self.locale == "C":
+            return f"{rate}%"
+        exponent = Decimal(rate).normalize().as_tuple().exponent
+        places = -exponent if isinstance(exponent, int) and exponent < 0 else 0
+        return self.format_number(rate, places) + "%"
+
+    def format_number(self, value: Decimal, places: int = 2) -> str:
+        """Plain number with locale separators"""
+        return f"{value:,.{places}f}".translate(self._separators)
+
+
+# Formatters by (currency, locale), built on first use
+_formatters: Dict[Tuple[str, str], MoneyFormatter] = {}
+_formatters_lock = threading.Lock()
+
+
+def get_formatter(currency: str, locale: Optional[str] = None) -> MoneyFormatter:
+    """Shared formatter for a currency and locale (defaults to DEFAULT_LOCALE)"""
+    key = (currency.upper(), locale or DEFAULT_LOCALE)
+    formatter = _formatters.get(key)
+    if formatter is None:
+        with _formatters_lock:
+            formatter = _formatters.get(key)
+            if formatter is None:
+                formatter = _formatters[key] = MoneyFormatter(*key)
+    return formatter
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, Optional
+
+from impoved_code.models.render_timings import RenderTimings
+
+
+class RenderCollector(ABC):
+    """Receives per-stage timings of every instrumented render"""
+
+    @abstractmethod
+    def collect(self, timings: RenderTimings):
+        """Handle the timings of one finished render"""
+
+
+class CallbackCollector(RenderCollector):
+    """Passes timings to a callable"""
+
+    def __init__(self, callback: Callable[[RenderTimings], None]):
+        self.callback = callback
+
+    def collect(self, timings: RenderTimings):
+        self.callback(timings)
+
+
+class LoggingCollector(RenderCollector):
+    """Writes one structured JSON log line per render"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("impoved_code.render")
+        self.level = level
+
+    def collect(self, timings: RenderTimings):
+        if self.logger.isEnabledFor(self.level):
+            self.logger.log(self.level, "invoice_render %s", json.dumps(timings.model_dump(), ensure_ascii=False))
+
+
+class CounterCollector(RenderCollector):
+    """Prometheus-style cumulative counters, safe to share between threads"""
+
+    PREFIX = "invoice_render"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.invoices = 0
+        self.cached = 0
+        self.pages = 0
+        self.output_bytes = 0
+        self.seconds = defaultdict(float)
+        self.draw_ops = defaultdict(int)
+
+    def collect(self, timings: RenderTimings):
+        with self._lock:
+            self.renders += 1
+            self.invoices += timings.invoices
+            self.cached += timings.cached
+            self.pages += timings.pages
+            self.output_bytes += timings.output_bytes
+            for stage, seconds in timings.seconds.items():
+                self.seconds[stage] += seconds
+            for stage, ops in timings.draw_ops.items():
+                self.draw_ops[stage] += ops
+
+    def snapshot(self) -> dict:
+        """Copy of all counters"""
+        with self._lock:
+            return {
+                "renders": self.renders,
+                "invoices": self.invoices,
+                "cached": self.cached,
+                "pages": self.pages,
+                "output_bytes": self.output_bytes,
+                "bytes_per_invoice": self.output_bytes / self.invoices if self.invoices else 0.0,
+                "seconds": dict(self.seconds),
+                "draw_ops": dict(self.draw_ops),
+            }
+
+    def exposition(self) -> str:
+        """Counters in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# TYPE {self.PREFIX}_total counter",
+            f"{self.PREFIX}_total {snapshot['renders']}",
+            f"# TYPE {self.PREFIX}_invoices_total counter",
+            f"{self.PREFIX}_invoices_total {snapshot['invoices']}",
+            f"# TYPE {self.PREFIX}_cached_total counter",
+            f"{self.PREFIX}_cached_total {snapshot['cached']}",
+            f"# TYPE {self.PREFIX}_pages_total counter",
+            f"{self.PREFIX}_pages_total {snapshot['pages']}",
+            f"# TYPE {self.PREFIX}_output_bytes_total counter",
+            f"{self.PREFIX}_output_bytes_total {snapshot['output_bytes']}",
+            f"# TYPE {self.PREFIX}_stage_seconds_total counter",
+        ]
+        lines.extend(
+            f'{self.PREFIX}_stage_seconds_total{{stage="{stage}"}} {seconds:.6f}'
+            for stage, seconds in sorted(snapshot["seconds"].items())
+        )
+        lines.append(f"# TYPE {self.PREFIX}_stage_draw_ops_total counter")
+        lines.extend(
+            f'{self.PREFIX}_stage_draw_ops_total{{stage="{stage}"}} {ops}'
+            for stage, ops in sorted(snapshot["draw_ops"].items())
+        )
+        return "\n".join(lines) + "\n"
+
+
+class RenderProbe:
+    """
+    Measures consecutive render stages of one document
+
+    Each lap records the wall time and the number of PDF operators appended to
+    page content streams since the previous lap. Laps with the same stage name,
+    e.g. one per invoice of a statement, are summed.
+    """
+
+    def __init__(self, collector: RenderCollector, invoice_number: Optional[str] = None, profile: Optional[str] = None):
+        self.collector = collector
+        self.timings = RenderTimings(invoice_number=invoice_number, profile=profile)
+        # Operators of pages already finished with showPage
+        self._finished_ops = 0
+        self._last_ops = 0
+        self._last_time = time.perf_counter()
+
+    def lap(self, stage: str, canvas_obj=None):
+        """Close the stage that ran since the previous lap"""
+        now = time.perf_counter()
+        ops = self._finished_ops + len(canvas_obj._code) if canvas_obj is not None else self._last_ops
+
+        seconds = self.timings.seconds
+        seconds[stage] = seconds.get(stage, 0.0) + now - self._last_time
+        draw_ops = self.timings.draw_ops
+        draw_ops[stage] = draw_ops.get(stage, 0) + ops - self._last_ops
+
+        self._last_ops = ops
+        self._last_time = now
+
+    def page_break(self, canvas_obj):
+        """Account for the current page before showPage discards its operator list"""
+        self._finished_ops += len(canvas_obj._code)
+
+    def finish(self, output_bytes: int, pages: int = 0, invoices: int = 1, cached: bool = False):
+        """Hand the collected timings to the collector"""
+        self.timings.output_bytes = output_bytes
+        self.timings.pages = pages
+        self.timings.invoices = invoices
+        self.timings.cached = cached
+        self.collector.collect(self.timings)
+
+
+class _NullProbe:
+    """Stand-in used when no collector is configured"""
+
+    def lap(self, stage: str, canvas_obj=None):
+        pass
+
+    def page_break(self, canvas_obj):
+        pass
+
+    def finish(self, output_bytes: int, pages: int = 0, invoices: int = 1, cached: bool = False):
+        pass
+
+
+NULL_PROBE = _NullProbe()
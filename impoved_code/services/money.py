@@ -0,0 +1,117 @@
+from decimal import Decimal, ROUND_HALF_UP
+from collections import abc
+from typing import Any, Iterable, List, Mapping, Union
+
+from impoved_code.config.currencies import CurrencyMapping
+from impoved_code.models.invoice_data import InvoiceData, LineItem
+from impoved_code.models.invoice_totals import InvoiceTotals
+
+
+# Every amount is rounded half up to the currency's minor unit
+ROUNDING = ROUND_HALF_UP
+
+_ONE = Decimal(1)
+_HUNDRED = Decimal(100)
+
+
+def to_minor_units(amount: Decimal, exponent: int) -> int:
+    """Round an amount to integer minor units"""
+    return int(Decimal(amount).scaleb(exponent).to_integral_value(ROUNDING))
+
+
+def from_minor_units(units: int, exponent: int) -> Decimal:
+    """Convert integer minor units back to a Decimal amount"""
+    return Decimal(units).scaleb(-exponent)
+
+
+class TotalsAccumulator:
+    """Single-pass invoice totals in integer minor units"""
+
+    def __init__(self, vat_rate: Decimal, currency: str, keep_lines: bool = True):
+        """
+        Args:
+            vat_rate: VAT rate percentage
+            currency: Currency code
+            keep_lines: Keep every line amount for the resulting InvoiceTotals
+        """
+        self.vat_rate = Decimal(vat_rate)
+        self.currency = currency
+        self.exponent = CurrencyMapping.get_minor_units(currency)
+        self._scale = _ONE.scaleb(self.exponent)
+        self.keep_lines = keep_lines
+        self.line_amounts: List[int] = []
+        self.subtotal_minor = 0
+
+    def add(self, quantity: Decimal, unit_price: Decimal) -> int:
+        """
+        Add a line item
+
+        Returns:
+            int: Rounded line amount in minor units
+        """
+        # Positional rounding: keyword arguments to decimal methods are noticeably slower
+        line_minor = int((Decimal(quantity) * Decimal(unit_price) * self._scale).to_integral_value(ROUNDING))
+        self.subtotal_minor += line_minor
+        if self.keep_lines:
+            self.line_amounts.append(line_minor)
+        return line_minor
+
+    def result(self) -> InvoiceTotals:
+        """Totals for everything added so far; VAT is rounded once on the subtotal"""
+        vat_minor = int((Decimal(self.subtotal_minor) * self.vat_rate / _HUNDRED).quantize(_ONE, rounding=ROUNDING))
+        return InvoiceTotals(
+            currency=self.currency,
+            exponent=self.exponent,
+            line_amounts=self.line_amounts,
+            subtotal_minor=self.subtotal_minor,
+            vat_minor=vat_minor,
+            total_minor=self.subtotal_minor + vat_minor,
+        )
+
+
+def compute_totals(line_items: Iterable[Any], vat_rate: Decimal, currency: str) -> InvoiceTotals:
+    """
+    Compute line, VAT and total amounts in one pass
+
+    Args:
+        line_items: LineItem objects or mappings with quantity and unit_price
+        vat_rate: VAT rate percentage
+        currency: Currency code
+
+    Returns:
+        InvoiceTotals: Exact totals in minor units
+    """
+    accumulator = TotalsAccumulator(vat_rate, currency)
+    add = accumulator.add
+    for item in line_items:
+        # typing.Mapping checks are slow, and most items are LineItem objects
+        if not isinstance(item, LineItem) and isinstance(item, abc.Mapping):
+            add(Decimal(str(item["quantity"])), Decimal(str(item["unit_price"])))
+        else:
+            add(item.quantity, item.unit_price)
+    return accumulator.result()
+
+
+def compute_totals_batch(invoices: Iterable[Union[InvoiceData, Mapping[str, Any]]]) -> List[InvoiceTotals]:
+    """
+    Compute totals for many invoices without building renderers
+
+    Args:
+        invoices: InvoiceData objects or raw invoice mappings (line_items, vat_rate, currency)
+
+    Returns:
+        List[InvoiceTotals]: Totals in input order
+    """
+    results = []
+    for invoice in invoices:
+        if isinstance(invoice, InvoiceData):
+            results.append(invoice.totals)
+        else:
+            results.append(
+                compute_totals(
+                    invoice.get("line_items", ()),
+                    Decimal(str(invoice.get("vat_rate", "20.0"))),
+                    invoice.get("currency", "USD"),
+                )
+            )
+    return results
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from impoved_code.models.invoice_data import InvoiceData
+
+
+class RenderCache:
+    """Content-addressed cache of rendered PDFs: size-bounded disk LRU with an optional memory tier"""
+
+    # Bump when drawing code changes so previously cached documents are never served
+    TEMPLATE_VERSION = 2
+
+    FILE_SUFFIX = ".pdf"
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+    ):
+        """
+        Args:
+            cache_dir: Directory for cached PDFs
+            max_disk_bytes: Size limit of the disk tier
+            max_memory_bytes: Size limit of the memory tier; 0 disables it
+        """
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.store_errors = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def make_key(self, invoice_data: InvoiceData, versions: Iterable[str]) -> str:
+        """
+        Canonical hash of invoice content and everything else that affects the output
+
+        Args:
+            invoice_data: Invoice data
+            versions: Settings, font and renderer option fingerprints
+
+        Returns:
+            str: Cache key
+        """
+        payload = json.dumps(
+            {
+                "invoice": invoice_data.model_dump(mode="json"),
+                "versions": list(versions),
+                "template": self.TEMPLATE_VERSION,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached PDF bytes for a key, or None"""
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return content
+
+            if key not in self._disk:
+                self.misses += 1
+                return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as cache_file:
+                content = cache_file.read()
+            os.utime(path)
+        except OSError:
+            # Removed by another process sharing the directory
+            with self._lock:
+                self._drop_disk_entry(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.disk_hits += 1
+            self._remember(key, content)
+        return content
+
+    def put(self, key: str, content: bytes):
+        """
+        Store PDF bytes for a key
+
+        The cache is best effort: when the file cannot be written (disk full, permissions)
+        the document is kept in the memory tier only and counted in store_errors.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as cache_file:
+                cache_file.write(content)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            with self._lock:
+                self.store_errors += 1
+                self._remember(key, content)
+            return
+
+        with self._lock:
+            self._drop_disk_entry(key)
+            self._disk[key] = len(content)
+            self._disk_bytes += len(content)
+            self.stores += 1
+            self._remember(key, content)
+
+            # Evict least recently used documents until the disk tier fits again
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                old_key, _ = next(iter(self._disk.items()))
+                self._drop_disk_entry(old_key)
+                self._drop_memory_entry(old_key)
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None):
+        """
+        Remove one cached document, or everything when no key is given
+
+        Call without a key after template or settings changes that are not covered by the key.
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._disk)
+            for old_key in keys:
+                self._drop_disk_entry(old_key)
+                self._drop_memory_entry(old_key)
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+            if key is None:
+                self._memory.clear()
+                self._memory_bytes = 0
+
+    def stats(self) -> dict:
+        """Hit, miss, store, store error and eviction counters with tier sizes"""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "store_errors": self.store_errors,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.FILE_SUFFIX)
+
+    def _load_index(self):
+        """Rebuild the LRU order of the disk tier from file modification times"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(self.FILE_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[: -len(self.FILE_SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _remember(self, key: str, content: bytes):
+        """Put a document into the memory tier, evicting old entries to fit"""
+        if len(content) > self.max_memory_bytes:
+            return
+        self._drop_memory_entry(key)
+        self._memory[key] = content
+        self._memory_bytes += len(content)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, old_content = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_content)
+
+    def _drop_memory_entry(self, key: str):
+        content = self._memory.pop(key, None)
+        if content is not None:
+            self._memory_bytes -= len(content)
+
+    def _drop_disk_entry(self, key: str):
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+
+from pydantic import ValidationError
+
+from impoved_code.config.output_profiles import PROFILES, OutputProfile
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.services import batch_renderer
+
+
+class RenderServer:
+    """Local HTTP service rendering InvoiceData JSON to PDF with warm worker processes"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: Optional[int] = None,
+        max_queue: int = 256,
+        render_timeout: float = 60.0,
+        max_body_bytes: int = 16 * 1024 * 1024,
+        output_profile: Union[str, OutputProfile] = "default",
+        settings: Optional[InvoiceSettings] = None,
+    ):
+        """
+        Args:
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free port
+            workers: Number of renderer processes (defaults to CPU count)
+            max_queue: Maximum number of accepted renders before answering 503
+            render_timeout: Seconds to wait for a single render
+            max_body_bytes: Maximum request body size
+            output_profile: Output profile of the rendered PDFs
+            settings: Layout settings of the worker renderers (defaults to InvoiceSettings)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.output_profile = output_profile
+        self.settings = settings
+        self.max_queue = max_queue
+        self.render_timeout = render_timeout
+        self.max_body_bytes = max_body_bytes
+
+        self.executor = self._new_executor()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rendered = 0
+        self.failed = 0
+        self.rejected = 0
+        self.executor_restarts = 0
+        # Set when a worker died, cleared once the replacement pool is warm
+        self.pool_broken = False
+
+    @property
+    def address(self) -> tuple:
+        """(host, port) the server is bound to"""
+        return self.httpd.server_address
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=batch_renderer._init_worker,
+            initargs=(self.output_profile, self.settings),
+        )
+
+    def _replace_executor(self, broken: ProcessPoolExecutor):
+        """
+        Swap in a fresh pool after a worker died; concurrent callers replace it only once
+
+        The new pool is warmed up in the background and the server reports itself
+        unavailable until it is, so requests after a crash do not each pay the cold start.
+        """
+        with self._lock:
+            self.pool_broken = True
+            if self.executor is not broken:
+                return
+            executor = self.executor = self._new_executor()
+            self.executor_restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+        threading.Thread(target=self._warm_replacement, args=(executor,), daemon=True).start()
+
+    def _warm_replacement(self, executor: ProcessPoolExecutor):
+        """Warm up a replacement pool and mark the server healthy if it is still the current one"""
+        try:
+            self.warm_up(executor)
+        except Exception:
+            # Still broken: the next request replaces it again
+            return
+        with self._lock:
+            if self.executor is executor:
+                self.pool_broken = False
+
+    def _submit(self, invoice_data: InvoiceData) -> tuple:
+        """
+        Submit a render, rebuilding the pool once if it is already broken
+
+        Returns:
+            tuple: (executor, future)
+        """
+        executor = self.executor
+        try:
+            return executor, executor.submit(batch_renderer._worker_render_to_bytes, invoice_data)
+        except BrokenProcessPool:
+            self._replace_executor(executor)
+            executor = self.executor
+            return executor, executor.submit(batch_renderer._worker_render_to_bytes, invoice_data)
+
+    def _release(self, future):
+        """Free the queue slot once the render has actually finished or was cancelled"""
+        with self._lock:
+            self.pending -= 1
+
+    def pool_state(self) -> dict:
+        """Whether the worker pool can accept renders, for the health check"""
+        with self._lock:
+            broken = self.pool_broken
+            restarts = self.executor_restarts
+        return {
+            "status": "unavailable" if broken else "ok",
+            "workers": self.workers,
+            "pool": "restarting" if broken else "running",
+            "executor_restarts": restarts,
+        }
+
+    def warm_up(self, executor: Optional[ProcessPoolExecutor] = None):
+        """Start every worker process and load fonts before the first request"""
+        executor = executor or self.executor
+        futures = [executor.submit(batch_renderer._worker_ping) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def serve_forever(self):
+        self.warm_up()
+        self.httpd.serve_forever()
+
+    def start(self) -> threading.Thread:
+        """Serve from a background thread, e.g. in tests on localhost"""
+        self.warm_up()
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.executor.shutdown(cancel_futures=True)
+
+    def queue_stats(self) -> dict:
+        """Renders in flight split into running and queued, plus counters"""
+        with self._lock:
+            running = min(self.pending, self.workers)
+            return {
+                "workers": self.workers,
+                "in_flight": self.pending,
+                "running": running,
+                "queued": self.pending - running,
+                "max_queue": self.max_queue,
+                "rendered": self.rendered,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "executor_restarts": self.executor_restarts,
+            }
+
+    def render(self, body: bytes) -> tuple:
+        """
+        Validate and render a request body
+
+        Returns:
+            tuple: (HTTP status, content type, response body)
+        """
+        try:
+            invoice_data = InvoiceData.model_validate_json(body)
+        except ValidationError as exc:
+            return 422, "application/json", exc.json(include_url=False).encode("utf-8")
+
+        with self._lock:
+            if self.pending >= self.max_queue:
+                self.rejected += 1
+                return 503, "application/json", b'{"error": "render queue is full"}'
+            self.pending += 1
+
+        # The slot is held until the worker is done with the render: a timed-out render
+        # keeps running in its process and still counts against max_queue
+        executor = future = None
+        try:
+            executor, future = self._submit(invoice_data)
+            future.add_done_callback(self._release)
+            content = future.result(timeout=self.render_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            status, content = 504, b'{"error": "render timed out"}'
+        except BrokenProcessPool:
+            # A worker died, e.g. killed by the OOM killer; later requests get a fresh pool
+            self._replace_executor(executor or self.executor)
+            status, content = 503, b'{"error": "render worker exited, retry the request"}'
+        except Exception as exc:
+            status, content = 500, json.dumps({"error": f"{type(exc).__name__}: {exc}"}).encode("utf-8")
+        else:
+            with self._lock:
+                self.rendered += 1
+            return 200, "application/pdf", content
+        finally:
+            if future is None:
+                # Never submitted, so no callback will free the slot
+                self._release(None)
+
+        with self._lock:
+            self.failed += 1
+        return status, "application/json", content
+
+    def _handler_class(self):
+        server = self
+
+        class RenderRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/health":
+                    state = server.pool_state()
+                    self._send(200 if state["status"] == "ok" else 503, "application/json", json.dumps(state).encode())
+                elif self.path == "/queue":
+                    self._send(200, "application/json", json.dumps(server.queue_stats()).encode())
+                elif self.path == "/schema":
+                    self._send(200, "application/json", json.dumps(InvoiceData.model_json_schema()).encode())
+                else:
+                    self._send(404, "application/json", b'{"error": "not found"}')
+
+            def do_POST(self):
+                if self.path != "/invoices":
+                    self._send(404, "application/json", b'{"error": "not found"}')
+                    return
+
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.close_connection = True
+                    self._send(400, "application/json", b'{"error": "invalid Content-Length"}')
+                    return
+                if length > server.max_body_bytes:
+                    self.close_connection = True
+                    self._send(413, "application/json", b'{"error": "request body too large"}')
+                    return
+
+                status, content_type, content = server.render(self.rfile.read(length))
+                self._send(status, content_type, content)
+
+            def _send(self, status: int, content_type: str, content: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                # Access logging is left to the deployment's proxy
+                pass
+
+        return RenderRequestHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve invoice rendering over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Number of renderer processes")
+    parser.add_argument("--max-queue", type=int, default=256, help="Maximum number of accepted renders")
+    parser.add_argument("--profile", default="default", choices=sorted(PROFILES), help="Output profile")
+    args = parser.parse_args()
+
+    server = RenderServer(
+        args.host, args.port, workers=args.workers, max_queue=args.max_queue, output_profile=args.profile
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+def wrap_text(text: str, font_name: str, font_size: float, width: float, lead_width: float = 0.0) -> List[str]:
+    """
+    Greedy word wrap by measured width; words wider than a line are split by characters
+    
+    Args:
+        text: Text to wrap
+        font_name: Registered font name
+        font_size: Font size
+        width: Available line width
+        lead_width: Width of a leading word (e.g. item number) placed before the text on the first line
+        
+    Returns:
+        List[str]: Wrapped lines; the first line does not include the leading word
+    """
+    space_width = stringWidth(" ", font_name, font_size)
+    lines = []
+    current = []
+    current_width = lead_width
+    line_started = lead_width > 0
+
+    for word in text.split():
+        word_width = stringWidth(word, font_name, font_size)
+
+        if word_width > width:
+            # Flush the current line and break the long word wherever it overflows
+            if line_started:
+                lines.append(" ".join(current))
+            chunk = ""
+            for char in word:
+                if chunk and stringWidth(chunk + char, font_name, font_size) > width:
+                    lines.append(chunk)
+                    chunk = ""
+                chunk += char
+            current, current_width, line_started = [chunk], stringWidth(chunk, font_name, font_size), True
+            continue
+
+        if not line_started:
+            current, current_width, line_started = [word], word_width, True
+        elif current_width + space_width + word_width > width:
+            lines.append(" ".join(current))
+            current, current_width = [word], word_width
+        else:
+            current.append(word)
+            current_width += space_width + word_width
+
+    if line_started:
+        lines.append(" ".join(current))
+    return lines
+
+
+class TextLayoutCache:
+    """Bounded LRU cache of wrapped text, keyed by (text, font, size, width)"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def wrap(
+        self,
+        text: str,
+        font_name: str,
+        font_size: float,
+        width: float,
+        leading: float,
+        lead_width: float = 0.0,
+    ) -> Tuple[Tuple[str, ...], float]:
+        """
+        Wrap text, reusing a previous layout when the same text was already wrapped
+        
+        Args:
+            text: Text to wrap
+            font_name: Registered font name
+            font_size: Font size
+            width: Available line width
+            leading: Line height
+            lead_width: Width of a leading word on the first line, see wrap_text
+            
+        Returns:
+            tuple: (wrapped lines, text height)
+        """
+        key = (text, font_name, font_size, width, lead_width)
+
+        with self._lock:
+            lines = self._entries.get(key)
+            if lines is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return lines, max(len(lines), 1) * leading
+            self.misses += 1
+
+        lines = tuple(wrap_text(text, font_name, font_size, width, lead_width))
+
+        with self._lock:
+            self._entries[key] = lines
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return lines, max(len(lines), 1) * leading
+
+    def stats(self) -> dict:
+        """Cache counters and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Drop all cached layouts and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Layout cache shared by all renderers in the process
+default_layout_cache = TextLayoutCache()
@@ -0,0 +1,311 @@
+import gc
+import multiprocessing
+import os
+import time
+from itertools import islice
+from multiprocessing.connection import wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from impoved_code.config.output_profiles import OutputProfile
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.models.invoice_data import InvoiceData
+from impoved_code.models.render_result import RenderResult
+from impoved_code.renderers.invoice_renderer import InvoiceRenderer
+from impoved_code.services.batch_renderer import _render_one
+
+Job = Tuple[int, InvoiceData, Optional[str]]
+
+
+def memory_usage() -> Tuple[int, int]:
+    """
+    Memory of the current process in bytes
+
+    Returns:
+        tuple: (resident set size, private bytes); private bytes exclude pages still
+            shared copy-on-write with the parent and are 0 where they cannot be read
+    """
+    rss = private = 0
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        with open("/proc/self/smaps_rollup") as smaps:
+            for line in smaps:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    private += int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        try:
+            import resource
+
+            # Peak rather than current RSS, in kilobytes on Linux
+            rss = rss or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except ImportError:
+            pass
+    return rss, private
+
+
+def _worker_main(conn, renderer: InvoiceRenderer, max_invoices: Optional[int], max_rss_bytes: Optional[int]):
+    """
+    Worker loop: render chunks until told to stop or until the recycling policy retires the worker
+
+    Every reply is (results, stats, retire_reason); retire_reason is None while the worker keeps running.
+    """
+    invoices = 0
+    busy_seconds = 0.0
+    while True:
+        try:
+            chunk = conn.recv()
+        except EOFError:
+            break
+        if chunk is None:
+            break
+
+        started = time.perf_counter()
+        results = [_render_one(renderer, index, invoice_data, target) for index, invoice_data, target in chunk]
+        busy_seconds += time.perf_counter() - started
+        invoices += len(results)
+
+        rss, private = memory_usage()
+        retire_reason = None
+        if max_invoices and invoices >= max_invoices:
+            retire_reason = "invoices"
+        elif max_rss_bytes and rss > max_rss_bytes:
+            retire_reason = "rss"
+
+        stats = {"invoices": invoices, "busy_seconds": busy_seconds, "rss_bytes": rss, "private_bytes": private}
+        conn.send((results, stats, retire_reason))
+        if retire_reason:
+            break
+    conn.close()
+
+
+class _Worker:
+    """Parent-side handle of one forked worker"""
+
+    def __init__(self, process, conn, generation: int):
+        self.process = process
+        self.conn = conn
+        self.generation = generation
+        self.started = time.monotonic()
+        self.chunk: Optional[List[Job]] = None
+        self.stats = {"invoices": 0, "busy_seconds": 0.0, "rss_bytes": 0, "private_bytes": 0}
+
+    def snapshot(self) -> dict:
+        busy_seconds = self.stats["busy_seconds"]
+        return {
+            "pid": self.process.pid,
+            "generation": self.generation,
+            "uptime_seconds": time.monotonic() - self.started,
+            **self.stats,
+            "invoices_per_second": self.stats["invoices"] / busy_seconds if busy_seconds else 0.0,
+        }
+
+
+class PreforkWorkerPool:
+    """
+    Long-lived pool of renderer processes forked from a preloaded parent
+
+    The renderer, settings, layout plan and parsed fonts are built once in the parent
+    before forking, so workers start without importing or parsing anything and share
+    those pages copy-on-write. Workers are replaced after max_invoices_per_worker
+    invoices or once their RSS exceeds max_rss_mb, which bounds the growth of
+    reportlab's process-wide caches in long-running services.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunksize: int = 8,
+        max_invoices_per_worker: Optional[int] = 1000,
+        max_rss_mb: Optional[float] = None,
+        output_profile: Union[str, OutputProfile] = "default",
+        settings: Optional[InvoiceSettings] = None,
+    ):
+        """
+        Args:
+            workers: Number of worker processes (defaults to CPU count)
+            chunksize: Number of invoices sent to a worker per task
+            max_invoices_per_worker: Invoices after which a worker is replaced; None disables it
+            max_rss_mb: Resident memory in MiB after which a worker is replaced; None disables it
+            output_profile: Output profile of the rendered PDFs
+            settings: Layout settings of the renderer (defaults to InvoiceSettings)
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("PreforkWorkerPool requires the fork start method, which this platform lacks")
+
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = max(1, chunksize)
+        self.max_invoices_per_worker = max_invoices_per_worker
+        self.max_rss_bytes = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+
+        self._context = multiprocessing.get_context("fork")
+        self.renderer = InvoiceRenderer(output_profile=output_profile, settings=settings)
+        self._pool: List[_Worker] = []
+        self._generation = 0
+        self.recycled: Dict[str, int] = {"invoices": 0, "rss": 0, "crashed": 0}
+        self.retired_invoices = 0
+
+    def start(self) -> "PreforkWorkerPool":
+        """Preload fonts in this process and fork the workers"""
+        if not self._pool:
+            self.renderer.font_manager.register_times_fonts()
+            for _ in range(self.workers):
+                self._pool.append(self._fork())
+        return self
+
+    def iter_render(self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]]) -> Iterator[RenderResult]:
+        """
+        Render jobs and yield results as they complete
+
+        Args:
+            jobs: Iterable of (invoice_data, target) pairs; a None target returns PDF bytes in the result
+
+        Yields:
+            RenderResult: Per-invoice result, in completion order
+        """
+        self.start()
+        chunks = self._chunks(jobs)
+
+        try:
+            yield from self._dispatch(chunks)
+        finally:
+            # Chunks still in flight when the caller stops iterating are discarded
+            for worker in list(self._pool):
+                if worker.chunk is not None:
+                    for _ in self._receive(worker):
+                        pass
+
+    def render_many(self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]]) -> List[RenderResult]:
+        """
+        Render jobs and return results in submission order
+
+        Args:
+            jobs: Iterable of (invoice_data, target) pairs
+
+        Returns:
+            List[RenderResult]: One result per job
+        """
+        return sorted(self.iter_render(jobs), key=lambda result: result.index)
+
+    def stats(self) -> dict:
+        """Per-worker memory and throughput, plus recycling counters"""
+        return {
+            "workers": [worker.snapshot() for worker in self._pool],
+            "recycled": dict(self.recycled),
+            "retired_invoices": self.retired_invoices,
+        }
+
+    def close(self):
+        """Stop the workers after their current chunk"""
+        for worker in self._pool:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self._pool:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+            worker.conn.close()
+        self._pool.clear()
+
+    def __enter__(self) -> "PreforkWorkerPool":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _fork(self) -> _Worker:
+        """Fork one worker from the preloaded parent"""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.renderer, self.max_invoices_per_worker, self.max_rss_bytes),
+            daemon=True,
+        )
+        # Objects that exist at fork time are hidden from the worker's collector, so its
+        # collections do not write to their headers and unshare the pages holding them;
+        # the parent collects them again right after the fork
+        gc.freeze()
+        try:
+            process.start()
+        finally:
+            gc.unfreeze()
+        child_conn.close()
+        self._generation += 1
+        return _Worker(process, parent_conn, self._generation)
+
+    def _dispatch(self, chunks: Iterator[List[Job]]) -> Iterator[RenderResult]:
+        """Keep every worker busy until the chunks run out"""
+        exhausted = False
+        while True:
+            # Hand a chunk to every idle worker
+            for worker in self._pool:
+                if worker.chunk is None and not exhausted:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    worker.chunk = chunk
+                    try:
+                        worker.conn.send(chunk)
+                    except OSError:
+                        # The worker died while idle; its sentinel fails the chunk below
+                        pass
+
+            busy = [worker for worker in self._pool if worker.chunk is not None]
+            if not busy:
+                return
+
+            ready = wait([worker.conn for worker in busy] + [worker.process.sentinel for worker in busy])
+            for worker in busy:
+                if worker.conn in ready:
+                    yield from self._receive(worker)
+                elif worker.process.sentinel in ready:
+                    yield from self._crashed(worker)
+
+    def _receive(self, worker: _Worker) -> Iterator[RenderResult]:
+        """Collect a finished chunk and replace the worker if it retired"""
+        try:
+            results, stats, retire_reason = worker.conn.recv()
+        except EOFError:
+            yield from self._crashed(worker)
+            return
+
+        worker.chunk = None
+        worker.stats = stats
+        if retire_reason:
+            self.recycled[retire_reason] += 1
+            self._replace(worker)
+        yield from results
+
+    def _crashed(self, worker: _Worker) -> Iterator[RenderResult]:
+        """Fail the chunk of a worker that exited mid-task and replace the worker"""
+        chunk = worker.chunk or []
+        worker.process.join()
+        error = f"WorkerExited: worker {worker.process.pid} exited with code {worker.process.exitcode}"
+        self.recycled["crashed"] += 1
+        self._replace(worker)
+        for index, invoice_data, target in chunk:
+            yield RenderResult(
+                index=index,
+                invoice_number=getattr(invoice_data, "invoice_number", None),
+                target=None if target is None else str(target),
+                success=False,
+                error=error,
+            )
+
+    def _replace(self, worker: _Worker):
+        worker.process.join()
+        worker.conn.close()
+        self.retired_invoices += worker.stats["invoices"]
+        self._pool[self._pool.index(worker)] = self._fork()
+
+    def _chunks(self, jobs: Iterable[Tuple[InvoiceData, Optional[str]]]) -> Iterator[List[Job]]:
+        """Split jobs into numbered chunks"""
+        numbered = ((index, invoice_data, target) for index, (invoice_data, target) in enumerate(jobs))
+        while True:
+            chunk = list(islice(numbered, self.chunksize))
+            if not chunk:
+                return
+            yield chunk
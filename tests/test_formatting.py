@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from impoved_code.config.settings import InvoiceSettings
+from impoved_code.renderers.components.totals import TotalsRenderer
+from impoved_code.services.formatting import get_formatter
+
+
+class _TextCanvas:
+    """Records the strings drawn by a component"""
+
+    def __init__(self):
+        self.strings = []
+
+    def setFont(self, name, size):
+        pass
+
+    def setFillColor(self, color):
+        pass
+
+    def line(self, x1, y1, x2, y2):
+        pass
+
+    def drawString(self, x, y, text):
+        self.strings.append(text)
+
+    drawRightString = drawCentredString = drawString
+
+
+def test_uk_ua_amounts():
+    formatter = get_formatter("UAH", "uk_UA")
+    assert formatter.format(Decimal("1234.5")) == "1\u00a0234,50 ₴"
+    assert formatter.format(Decimal("-0.005")) == "-0,01 ₴"
+
+
+def test_uk_ua_percent():
+    formatter = get_formatter("UAH", "uk_UA")
+    assert formatter.format_percent(Decimal("20.0")) == "20%"
+    assert formatter.format_percent(Decimal("7.50")) == "7,5%"
+    assert formatter.format_percent(Decimal("0")) == "0%"
+
+
+def test_en_us_and_c_percent():
+    assert get_formatter("USD", "en_US").format_percent(Decimal("7.5")) == "7.5%"
+    # The C locale keeps the original renderer's output
+    assert get_formatter("USD", "C").format_percent(Decimal("20.0")) == "20.0%"
+
+
+def test_totals_use_the_locale_for_the_vat_rate():
+    canvas_obj = _TextCanvas()
+    TotalsRenderer(InvoiceSettings()).draw(canvas_obj, Decimal("1000"), Decimal("200"), Decimal("20.0"), "UAH", 500)
+    assert "ПДВ 20%:" in canvas_obj.strings
+    assert "1\u00a0200,00 ₴" in canvas_obj.strings
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from benchmarks.import_budget import BUDGETS, check_budgets
+
+# Multiplier for the time budgets on slow machines, as --scale of the script
+SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+
+@pytest.fixture(scope="module")
+def rows():
+    """One measurement per budgeted module, each import in fresh interpreters"""
+    return {row["module"]: row for row in check_budgets(SCALE)}
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_time_within_budget(rows, module):
+    row = rows[module]
+    assert not row["over_budget"], f"{module} imports in {row['ms']:.1f} ms, budget {row['budget_ms']:.0f} ms"
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_loads_no_forbidden_modules(rows, module):
+    assert rows[module]["forbidden_loaded"] == []
+
+
+@pytest.mark.parametrize(
+    "module",
+    [module for module in BUDGETS if module.startswith(("impoved_code.config.settings", "impoved_code.models."))],
+)
+def test_settings_and_models_do_not_load_reportlab_or_pil(module):
+    assert {"reportlab", "PIL"} <= set(BUDGETS[module][1])
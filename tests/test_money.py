@@ -0,0 +1,108 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from pydantic import ValidationError
+
+from impoved_code.models.invoice_data import BankDetails, CompanyInfo, InvoiceData, LineItem
+from impoved_code.services import money
+from impoved_code.services.money import TotalsAccumulator, compute_totals, to_minor_units
+
+
+def make_invoice(line_items, vat_rate="20", currency="USD") -> InvoiceData:
+    company = CompanyInfo(name="Company", edprou="12345678", address="Kyiv", country="Ukraine")
+    return InvoiceData(
+        seller=company,
+        buyer=company,
+        bank=BankDetails(name="Bank", mfo="305299", address="Dnipro", swift="PBANUA2X", iban="UA1"),
+        invoice_number="INV-1",
+        invoice_date="2024-01-15",
+        due_date="2024-02-15",
+        source="S1",
+        line_items=line_items,
+        vat_rate=Decimal(vat_rate),
+        currency=currency,
+    )
+
+
+def item(quantity: str, unit_price: str) -> LineItem:
+    return LineItem(description="Item", quantity=Decimal(quantity), unit_price=Decimal(unit_price))
+
+
+def test_line_amounts_round_half_up():
+    assert to_minor_units(Decimal("0.005"), 2) == 1
+    assert to_minor_units(Decimal("0.0049"), 2) == 0
+    assert to_minor_units(Decimal("-0.005"), 2) == -1
+    assert to_minor_units(Decimal("2.5"), 0) == 3
+
+    # 3 x 0.335 = 1.005 -> 1.01
+    totals = compute_totals([item("3", "0.335")], Decimal("0"), "USD")
+    assert totals.line_amounts == [101]
+
+
+def test_each_line_is_rounded_before_summing():
+    # Two lines of 0.005 each round to 0.01; rounding their unrounded sum would give 0.01
+    totals = compute_totals([item("1", "0.005"), item("1", "0.005")], Decimal("0"), "USD")
+    assert totals.line_amounts == [1, 1]
+    assert totals.subtotal == Decimal("0.02")
+
+
+def test_vat_is_rounded_once_on_the_subtotal():
+    # Per-line VAT of 0.01 x 20% rounds to 0.00 three times; on the 0.03 subtotal it is 0.006 -> 0.01
+    totals = compute_totals([item("1", "0.01")] * 3, Decimal("20"), "USD")
+    assert totals.subtotal_minor == 3
+    assert totals.vat_minor == 1
+    assert totals.total == Decimal("0.04")
+
+
+def test_zero_exponent_currency():
+    totals = compute_totals([item("1", "100.5"), item("2", "0.4")], Decimal("10"), "JPY")
+    assert totals.exponent == 0
+    assert totals.line_amounts == [101, 1]
+    # 10% of 102 = 10.2 -> 10
+    assert totals.vat_minor == 10
+    assert totals.total == Decimal("112")
+
+
+def test_three_exponent_currency():
+    totals = compute_totals([item("1", "1.2345")], Decimal("15"), "KWD")
+    assert totals.exponent == 3
+    assert totals.line_amounts == [1235]
+    # 15% of 1.235 = 0.18525 -> 0.185
+    assert totals.vat_minor == 185
+    assert totals.total == Decimal("1.420")
+
+
+def test_accumulator_matches_compute_totals():
+    items = [item("1.5", "19.99"), item("3", "0.333")]
+    accumulator = TotalsAccumulator(Decimal("20"), "UAH", keep_lines=False)
+    for line_item in items:
+        accumulator.add(line_item.quantity, line_item.unit_price)
+    assert accumulator.result().total_minor == compute_totals(items, Decimal("20"), "UAH").total_minor
+
+
+def test_invoice_totals_follow_changes():
+    invoice = make_invoice([item("1", "300.02")])
+    assert invoice.total == Decimal("360.02")
+
+    invoice.vat_rate = Decimal("0")
+    assert invoice.total == Decimal("300.02")
+
+    invoice.line_items += (item("1", "10"),)
+    assert invoice.total == Decimal("310.02")
+
+    assert invoice.model_copy(update={"line_items": ()}).total == Decimal("0.00")
+    assert invoice.total == Decimal("310.02")
+
+    with pytest.raises(ValidationError):
+        invoice.line_items[0].quantity = Decimal("2")
+
+
+def test_totals_are_computed_once_per_model_dump():
+    invoice = make_invoice([item("1", "10"), item("2", "0.5")])
+    with mock.patch.object(money, "compute_totals", wraps=money.compute_totals) as compute:
+        dumped = invoice.model_dump()
+        assert compute.call_count == 1
+        invoice.model_dump()
+        assert compute.call_count == 1
+    assert (dumped["subtotal"], dumped["vat_amount"], dumped["total"]) == (Decimal("11.00"), Decimal("2.20"), Decimal("13.20"))